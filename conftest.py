@@ -0,0 +1,6 @@
+import sys
+
+# These are interactive map-generation scripts written for the Windows console (msvcrt), not tests.
+collect_ignore = []
+if sys.platform != "win32":
+    collect_ignore += ["test_map.py", "test/test_map_generation.py", "test/test_mst_corridor.py"]
@@ -9,6 +9,8 @@ from src.game_state import GameState
 from src.utils.logger import Logger
 from src.systems.spawn_manager import SpawnManager
 from src.systems.event_manager import EventManager
+from src.systems.level_pregenerator import LevelPregenerator
+from src.utils.profiler import PhaseProfiler
 from src.ui.static_menus import WarningMenu
 
 def main(stdscr):
@@ -28,6 +30,14 @@ def main(stdscr):
     save_manager = SaveManager(ui_manager, settings_manager)
     logger = Logger(settings_manager)
     event_manager = EventManager() # Initialize EventManager
+    level_pregenerator = LevelPregenerator(settings_manager) # Builds the next level in a worker process
+    generation_profiler = None
+    if settings_manager.get_setting("profile_generation", False):
+        generation_profiler = PhaseProfiler(
+            event_manager,
+            sink_path=settings_manager.get_setting("profile_generation_sink", None),
+            trace_allocations=settings_manager.get_setting("profile_generation_allocations", False),
+        )
 
     # Create a placeholder for spawn_manager first
     spawn_manager = SpawnManager(None) # Will be updated later
@@ -40,6 +50,8 @@ def main(stdscr):
         logger=logger,
         spawn_manager=spawn_manager,
         event_manager=event_manager, # Pass the event_manager
+        level_pregenerator=level_pregenerator,
+        generation_profiler=generation_profiler,
         minimap_menu=None # Will be initialized later in Menu.start_new_game
     )
 
@@ -58,5 +70,8 @@ def main(stdscr):
     elif menu_result == "quit":
         pass # Exit the game
 
+    level_pregenerator.shutdown()
+    save_manager.shutdown()
+
 if __name__ == "__main__":
     curses.wrapper(main)
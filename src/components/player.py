@@ -64,7 +64,8 @@ class Player(Entity):
         from ..items.item_factory import create_item_from_dict
 
         new_player = cls(data["x"], data["y"], data.get("player_class_name"))
-        new_player.state = PlayerState.from_dict(data["state"])
+        # The oldest saves kept the stats on the player itself.
+        new_player.state = PlayerState.from_dict(data.get("state", data))
         new_player.inventory = [create_item_from_dict(item_data) for item_data in data.get("inventory", [])]
         return new_player
 
@@ -1,10 +1,14 @@
 import time
+from contextlib import contextmanager
 from .systems.command_handler import CommandHandler
 from .systems.interaction_manager import InteractionManager
+from .systems.timer_queue import TimerQueue
 from .ui.inventory_menu import InventoryMenu
+from .ui.minimap_menu import MinimapMenu
 from .systems.settings_manager import SettingsManager
 from .ui.ui_manager import UIManager
 from .game_state import GameState
+from .utils.profiler import LatencyHistogram
 
 from .world.tiles import WaterTile
 
@@ -16,40 +20,125 @@ class GameEngine:
         self.game_state.interaction_manager = InteractionManager(self.game_state)
         self.game_state.inventory_menu = InventoryMenu(self.game_state.player, self.game_state)
         self.last_move_time = 0
+        self.move_cooldown = 0.2  # Seconds between held-key moves; headless runs set 0
+        # Seconds spent per system, summed over the run, when set to a dict.
+        self.system_times = None
+        # Timed work (autosave, stats) runs off the timer queue between key presses.
+        self.timers = TimerQueue()
+        self.frame_times = LatencyHistogram("Frame time")
+        self.input_latency = LatencyHistogram("Input latency")
+        self.dirty = True
+        self.key_time = None
+        self.turns = 0
+        self._autosaved_turns = 0
 
     def run(self):
-        self.game_state.ui_manager.init_ui()
-        self.game_state.ui_manager.stdscr.nodelay(True)  # Set non-blocking mode
+        ui_manager = self.game_state.ui_manager
+        ui_manager.init_ui()
+        self._schedule_timers()
+        self.advance_turn()  # Initial field of view
 
         while self.game_state.is_running:
-            self.game_state.ui_manager.clear_screen()
+            if self.dirty:
+                self.render()
 
             if self.game_state.current_menu:
-                self.game_state.current_menu.display()
-            else:
-                self.render_game_world()
-
-            self.game_state.ui_manager.refresh()
-            
-            self.process_input()
+                self.process_input()
+                self.dirty = True
+                continue
 
+            # Sleep in getch until a key arrives or the next timer is due, instead of polling.
+            # While an autosave is being written, wake up to show its message when it lands.
+            limit = 0.05 if self.game_state.save_manager.autosave_pending else None
+            key = ui_manager.wait_for_key(self.timers.time_until_next(limit))
+            if self.timers.advance():
+                self.dirty = True
+            if self.game_state.event_manager and self.game_state.event_manager.dispatch_posted():
+                self.dirty = True
+            if key is None:
+                continue
+            self.key_time = time.perf_counter()
+            self.dirty = True
+            with self._system("commands"):
+                self.handle_key(key)
             if not self.game_state.current_menu:
-                self.game_state.interaction_manager.handle_interactions()
-                if self.game_state.player.moved:
-                    # A turn has passed, update player state
-                    self.game_state.player.[ state.update_effects()
-                    self.game_state.player.update_wellbeing() # Also update hunger/thirst
-
-                    self.game_state.game_map.update_fov(self.game_state.player)
-                    current_tile = self.game_state.game_map.grid[self.game_state.player.y][self.game_state.player.x]
-                    self.game_state.logger.log_tile_info(current_tile)
-                    self.game_state.player.moved = False
-            
-            time.sleep(0.05) # Add a small delay to the loop to prevent high CPU usage
+                self.advance_turn()
+
+    def render(self):
+        start = time.perf_counter()
+        if self.game_state.current_menu:
+            # Menus redraw from scratch; the game world only redraws what changed.
+            self.game_state.ui_manager.clear_screen()
+            self.game_state.current_menu.display()
+        else:
+            self.render_game_world()
+        self.game_state.ui_manager.refresh()
+        end = time.perf_counter()
+        self.frame_times.record(end - start)
+        if self.system_times is not None:
+            self.system_times["render"] = self.system_times.get("render", 0.0) + end - start
+        if self.key_time is not None:
+            self.input_latency.record(end - self.key_time)
+            self.key_time = None
+        self.dirty = False
+
+    def advance_turn(self):
+        with self._system("interactions"):
+            self.game_state.interaction_manager.handle_interactions()
+        if self.game_state.player.moved:
+            # A turn has passed, update player state
+            with self._system("effects"):
+                self.game_state.player.state.update_effects()
+                self.game_state.player.update_wellbeing() # Also update hunger/thirst
+
+            with self._system("fov"):
+                self.game_state.game_map.update_fov(self.game_state.player)
+            with self._system("log"):
+                current_tile = self.game_state.game_map.grid[self.game_state.player.y][self.game_state.player.x]
+                self.game_state.logger.log_tile_info(current_tile)
+            self.game_state.player.moved = False
+            self.turns += 1
+            if self.game_state.event_manager:
+                self.game_state.event_manager.publish("turn_end", self.turns)
+
+    @contextmanager
+    def _system(self, name):
+        if self.system_times is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.system_times[name] = self.system_times.get(name, 0.0) + time.perf_counter() - start
+
+    def _schedule_timers(self):
+        settings_manager = self.game_state.settings_manager
+        autosave_period = settings_manager.get_setting("autosave_period_seconds", 0)
+        if autosave_period > 0:
+            self.timers.schedule(autosave_period, self._timed_autosave, interval=autosave_period)
+        stats_period = settings_manager.get_setting("debug_loop_stats_seconds", 0)
+        if stats_period > 0:
+            self.timers.schedule(stats_period, self._log_loop_stats, interval=stats_period)
+
+    def _timed_autosave(self):
+        # Only save when a turn has passed since the last timed save, and never over a menu.
+        if self.turns == self._autosaved_turns or self.game_state.current_menu:
+            return
+        if not self.game_state.settings_manager.get_setting("autosave_enabled"):
+            return
+        message = self.game_state.save_manager.save_game(self.game_state, "autosave", is_autosave=True)
+        if message:
+            self.game_state.logger.add_message(message)
+        self._autosaved_turns = self.turns
+
+    def _log_loop_stats(self):
+        self.game_state.logger.add_message(self.frame_times.summary())
+        self.game_state.logger.add_message(self.input_latency.summary())
 
     def process_input(self):
         if self.game_state.current_menu:
-            self.game_state.ui_manager.stdscr.nodelay(False) # Disable non-blocking for menu input
+            self.game_state.ui_manager.stdscr.nodelay(False) # Menus wait for input
 
             if isinstance(self.game_state.current_menu, MinimapMenu):
                 # For MinimapMenu, we just need a single key press to exit
@@ -63,18 +152,18 @@ class GameEngine:
                 choice = self.game_state.ui_manager.get_string(prompt_y, 0, "Enter choice: ")
                 if self.game_state.current_menu.handle_input(choice):
                     self.game_state.current_menu = None
-            
-            self.game_state.ui_manager.stdscr.nodelay(True) # Re-enable non-blocking
         else:
-            key = self.game_state.ui_manager.get_key_if_available()
-            if key:
-                current_time = time.time()
-                if key in ['w', 'a', 's', 'd']:
-                    if current_time - self.last_move_time > 0.2: # Cooldown for held keys
-                        self.game_state.command_handler.handle_command(key)
-                        self.last_move_time = current_time
-                else:
+            self.handle_key(self.game_state.ui_manager.get_key_if_available())
+
+    def handle_key(self, key):
+        if key:
+            current_time = time.time()
+            if key in ['w', 'a', 's', 'd']:
+                if current_time - self.last_move_time >= self.move_cooldown: # Cooldown for held keys
                     self.game_state.command_handler.handle_command(key)
+                    self.last_move_time = current_time
+            else:
+                self.game_state.command_handler.handle_command(key)
 
     def display_settings_menu(self):
         pass
@@ -1,11 +1,13 @@
+import time
 from .ui.ui_manager import UIManager
 from .utils.logger import Logger
 from .systems.save_manager import SaveManager
+from .world.seeding import new_world_seed
 
 
 
 class GameState:
-    def __init__(self, player=None, game_map=None, settings_manager=None, save_manager=None, ui_manager:UIManager =None, command_handler=None, interaction_manager=None, inventory_menu=None, minimap_menu=None, logger: Logger = None, game_engine=None, spawn_manager=None, event_manager=None):
+    def __init__(self, player=None, game_map=None, settings_manager=None, save_manager=None, ui_manager:UIManager =None, command_handler=None, interaction_manager=None, inventory_menu=None, minimap_menu=None, logger: Logger = None, game_engine=None, spawn_manager=None, event_manager=None, level_pregenerator=None, generation_profiler=None):
         self.player = player
         self.game_map = game_map
         self.settings_manager = settings_manager
@@ -19,21 +21,56 @@ class GameState:
         self.game_engine = game_engine
         self.spawn_manager = spawn_manager
         self.event_manager = event_manager # Added event_manager
+        self.level_pregenerator = level_pregenerator
+        self.generation_profiler = generation_profiler  # PhaseProfiler, or None when profiling is off
         self.current_menu = None
         self.is_running = True
         self.step_count = 0
         self.on_special_tile = False
         self.dungeon_level = 1  # Initialize dungeon level
+        self.world_seed = new_world_seed()  # Maps are regenerated from (world_seed, dungeon_level)
+        self.play_time = 0.0  # Seconds played before this session
+        self.session_start = time.monotonic()
 
     def to_dict(self):
         return {
             "player": self.player.to_dict() if self.player else None,
             "game_map": self.game_map.to_dict() if self.game_map else None,
+            **self._game_fields(),
+        }
+
+    def total_play_time(self):
+        return self.play_time + time.monotonic() - self.session_start
+
+    def save_metadata(self):
+        """A few fields describing the save, written first so the save screen can read them alone."""
+        return {
+            "saved_at": time.time(),
+            "dungeon_level": self.dungeon_level,
+            "player_class": self.player.player_class_name if self.player else None,
+            "health": self.player.state.health if self.player else None,
+            "play_time": round(self.total_play_time()),
+            "world_seed": self.world_seed,
+        }
+
+    def to_sections(self):
+        """The game as named save sections: JSON-ready dicts plus the map's layers as arrays."""
+        sections = {"meta": self.save_metadata(), "game": self._game_fields(), "player": self.player.to_dict() if self.player else None}
+        if self.game_map:
+            delta = self.settings_manager.get_setting("save_terrain_delta", True) if self.settings_manager else False
+            sections["map"], layers = self.game_map.to_layers(delta=delta)
+            sections.update((f"map.{name}", layer) for name, layer in layers.items())
+        return sections
+
+    def _game_fields(self):
+        return {
             "current_menu": self.current_menu.__class__.__name__ if self.current_menu else None,
             "is_running": self.is_running,
             "step_count": self.step_count,
             "on_special_tile": self.on_special_tile,
             "dungeon_level": self.dungeon_level,  # Add dungeon_level to dictionary
+            "world_seed": self.world_seed,
+            "play_time": round(self.total_play_time()),
             "log": self.logger.get_messages() if self.logger else []
         }
 
@@ -53,6 +90,8 @@ class GameState:
         game_state.step_count = data.get("step_count", 0)
         game_state.on_special_tile = data.get("on_special_tile", False)
         game_state.dungeon_level = data.get("dungeon_level", 1)  # Load dungeon_level, default to 1
+        game_state.world_seed = data.get("world_seed", game_state.world_seed)  # Older saves get a fresh seed
+        game_state.play_time = data.get("play_time", 0.0)
         if logger and "log" in data:
             for msg in data["log"]:
                 logger.add_message(msg)
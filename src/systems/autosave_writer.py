@@ -0,0 +1,102 @@
+"""
+Writes autosaves on a background thread, so a save never stalls input.
+
+The game thread only takes a snapshot: arrays are copied and the JSON parts
+deep-copied, which is a few memcpys and no serialization. Encoding,
+compression, fsync and the rename all happen on the writer thread. A snapshot
+still waiting for the writer is replaced by a newer one for the same file, so
+a slow disk drops intermediate autosaves instead of queueing them.
+"""
+import copy
+import os
+import threading
+
+import numpy as np
+
+from .save_format import write_save
+
+def snapshot(sections):
+    """A copy of save sections that shares nothing with the live game."""
+    return {name: value.copy() if isinstance(value, np.ndarray) else copy.deepcopy(value)
+            for name, value in sections.items()}
+
+class AutosaveWriter:
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = {}  # path -> job; a newer job for a path replaces the waiting one
+        self._writing = False
+        self._closed = False
+        self.superseded = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, sections, codec, stale_path=None, event_manager=None, message="Game Autosaved!",
+               on_written=None, on_failed=None):
+        """
+        Queues a snapshot for writing to path. When it is on disk, stale_path
+        is removed, on_written is called (on the writer thread) and message is
+        posted as a "game_message" event. If writing fails, on_failed is
+        called instead and the error is posted.
+        """
+        with self._condition:
+            if self._closed or not self._thread.is_alive():
+                raise RuntimeError("AutosaveWriter is shut down.")
+            if path in self._pending:
+                self.superseded += 1
+            self._pending[path] = (sections, codec, stale_path, event_manager, message, on_written, on_failed)
+            self._condition.notify()
+
+    @property
+    def busy(self):
+        with self._condition:
+            return bool(self._pending) or self._writing
+
+    def flush(self):
+        """Blocks until every queued snapshot is on disk."""
+        with self._condition:
+            while self._pending or self._writing:
+                if not self._thread.is_alive():
+                    raise RuntimeError("AutosaveWriter stopped with snapshots still queued.")
+                self._condition.wait(0.1)
+
+    def shutdown(self):
+        """Writes what is queued, then stops the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                path = next(iter(self._pending))
+                job = self._pending.pop(path)
+                self._writing = True
+            try:
+                self._write(path, *job)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, path, sections, codec, stale_path, event_manager, message, on_written, on_failed):
+        try:
+            write_save(path, sections, codec)
+            if stale_path and os.path.exists(stale_path):
+                os.remove(stale_path)
+        except Exception as e:  # Not only OSError: anything escaping would end the thread with jobs still queued
+            if on_failed:
+                on_failed()
+            if event_manager:
+                event_manager.post("game_message", f"Autosave failed: {e}")
+            return
+        self.written += 1
+        if on_written:
+            on_written()
+        if event_manager:
+            event_manager.post("game_message", message)
@@ -24,7 +24,7 @@ class CommandHandler:
         return False
 
     def _handle_save_command(self):
-        available_saves = self.game_state.save_manager.list_saves()
+        available_saves = self.game_state.save_manager.list_saves_detailed()
         self.game_state.ui_manager.display_save_screen(available_saves)
         max_y, max_x = self.game_state.ui_manager.stdscr.getmaxyx()
         prompt_y = max_y - 1
@@ -36,8 +36,7 @@ class CommandHandler:
             self.game_state.logger.add_message("Save cancelled.")
             return False
 
-        game_state_data = self.game_state.to_dict()
-        message = self.game_state.save_manager.save_game(game_state_data, filename)
+        message = self.game_state.save_manager.save_game(self.game_state, filename)
         self.game_state.logger.add_message(message)
         return True
 
@@ -60,9 +59,9 @@ class CommandHandler:
         if self.game_state.settings_manager.get_setting("autosave_enabled"):
             self.game_state.step_count += 1
             if self.game_state.step_count >= self.game_state.settings_manager.get_setting("autosave_interval"):
-                game_state_data = self.game_state.to_dict()
-                message = self.game_state.save_manager.save_game(game_state_data, "autosave", is_autosave=True)
-                self.game_state.logger.add_message(message)
+                message = self.game_state.save_manager.save_game(self.game_state, "autosave", is_autosave=True)
+                if message:  # None while a background autosave is still writing
+                    self.game_state.logger.add_message(message)
                 self.game_state.step_count = 0
 
     def handle_command(self, key):
@@ -1,6 +1,10 @@
+from collections import deque
+
 class EventManager:
     def __init__(self):
         self.listeners = {}
+        # Events posted from other threads, delivered on the game thread by dispatch_posted.
+        self._posted = deque()
 
     def subscribe(self, event_type, listener):
         if event_type not in self.listeners:
@@ -15,3 +19,16 @@ class EventManager:
         if event_type in self.listeners:
             for listener in self.listeners[event_type]:
                 listener(*args, **kwargs)
+
+    def post(self, event_type, *args, **kwargs):
+        """Queues an event from any thread; listeners run when the game thread calls dispatch_posted."""
+        self._posted.append((event_type, args, kwargs))
+
+    def dispatch_posted(self):
+        """Publishes every posted event, oldest first. Returns how many there were."""
+        count = 0
+        while self._posted:
+            event_type, args, kwargs = self._posted.popleft()
+            self.publish(event_type, *args, **kwargs)
+            count += 1
+        return count
@@ -1,50 +1,169 @@
-def compute_fov(game_map, player_x, player_y, radius, last_direction='s'):
-    visible_tiles = set()
-    visible_tiles.add((player_x, player_y))
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+
+# Octant transforms (xx, xy, yx, yy): the cell `col` steps across and `depth`
+# steps out in an octant's scan is at (col * xx + depth * xy, col * yx + depth * yy)
+# from the viewer.
+_OCTANTS = [(1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+            (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)]
 
+def fov_radii(radius, last_direction):
     if last_direction in ['w', 's']:  # Vertical movement (circular FOV, appears as a tall ellipse)
-        x_radius = radius
-        y_radius = radius
-    else:  # Horizontal movement (elliptical FOV, appears as a wide ellipse)
-        # Account for character aspect ratio (approx. 1:2 width:height)
-        x_radius = int(radius * 2)  # Make it wider
-        y_radius = int(radius * 0.75) # Make it shorter to compensate
-
-    for x in range(player_x - x_radius, player_x + x_radius + 1):
-        for y in range(player_y - y_radius, player_y + y_radius + 1):
-            # Use ellipse equation for all cases.
-            if x_radius > 0 and y_radius > 0:
-                if ((x - player_x) / x_radius)**2 + ((y - player_y) / y_radius)**2 <= 1:
-                    if _is_in_line_of_sight(game_map, player_x, player_y, x, y):
-                        visible_tiles.add((x, y))
-    return visible_tiles
-
-def _is_in_line_of_sight(game_map, start_x, start_y, end_x, end_y):
-    """
-    Checks if there is an unobstructed line of sight between two points.
-    Uses Bresenham's Line Algorithm.
-    """
-    x1, y1 = start_x, start_y
-    x2, y2 = end_x, end_y
-    dx = abs(x2 - x1)
-    dy = abs(y2 - y1)
-    sx = 1 if x1 < x2 else -1
-    sy = 1 if y1 < y2 else -1
-    err = dx - dy
-
-    while True:
-        if x1 == x2 and y1 == y2:
-            return True
-
-        if (x1 != start_x or y1 != start_y) and (x1 != end_x or y1 != end_y):
-            if 0 <= x1 < game_map.width and 0 <= y1 < game_map.height:
-                if not game_map.grid[y1][x1].is_transparent:
-                    return False
-
-        e2 = 2 * err
-        if e2 > -dy:
-            err -= dy
-            x1 += sx
-        if e2 < dx:
-            err += dx
-            y1 += sy
+        return radius, radius
+    # Horizontal movement (elliptical FOV, appears as a wide ellipse)
+    # Account for character aspect ratio (approx. 1:2 width:height)
+    return int(radius * 2), int(radius * 0.75)
+
+@lru_cache(maxsize=None)
+def _ray_tables(x_radius, y_radius):
+    """
+    The scan rows of each octant out to the view ellipse, computed once per
+    radius pair. A row holds its cells in scan order, highest slope first,
+    as (dx, dy, high slope, low slope, inside the ellipse).
+    """
+    tables = []
+    for xx, xy, yx, yy in _OCTANTS:
+        # Rows step out along x when the depth maps to x, otherwise along y.
+        depth_limit = x_radius if xy else y_radius
+        rows = []
+        for depth in range(1, depth_limit + 1):
+            row = []
+            for col in range(depth, -1, -1):
+                dx, dy = col * xx + depth * xy, col * yx + depth * yy
+                in_range = (dx / x_radius) ** 2 + (dy / y_radius) ** 2 <= 1
+                row.append((dx, dy, (col + 0.5) / (depth - 0.5), (col - 0.5) / (depth + 0.5), in_range))
+            rows.append(row)
+        tables.append(rows)
+    return tables
+
+def shadowcast(transparent, viewer_x, viewer_y, x_radius, y_radius):
+    """
+    Recursive shadowcasting over a boolean transparency window. Returns a
+    mask of the same shape with the cells seen from (viewer_x, viewer_y)
+    inside the ellipse with semi-axes x_radius and y_radius. Opaque cells are
+    seen but block what lies behind them; cells outside the window block too.
+    """
+    height, width = transparent.shape
+    visible = np.zeros((height, width), dtype=bool)
+    if not (0 <= viewer_x < width and 0 <= viewer_y < height):
+        return visible
+    visible[viewer_y, viewer_x] = True
+    if x_radius <= 0 or y_radius <= 0:
+        return visible
+
+    # Plain lists index far faster than a NumPy array one cell at a time;
+    # only the ellipse's bounding box is converted.
+    left, top = max(viewer_x - x_radius, 0), max(viewer_y - y_radius, 0)
+    right, bottom = min(viewer_x + x_radius + 1, width), min(viewer_y + y_radius + 1, height)
+    clear = transparent[top:bottom, left:right].tolist()
+    lit = []
+
+    def cast(rows, first, start, end):
+        for depth in range(first, len(rows)):
+            blocked = False
+            new_start = start
+            for dx, dy, high, low, in_range in rows[depth]:
+                if start < low:
+                    continue
+                if end > high:
+                    break
+                x, y = viewer_x + dx, viewer_y + dy
+                inside = left <= x < right and top <= y < bottom
+                if in_range and inside:
+                    lit.append(y * width + x)
+                wall = not inside or not clear[y - top][x - left]
+                if blocked:
+                    if wall:
+                        new_start = low
+                    else:
+                        blocked = False
+                        start = new_start
+                elif wall and depth + 1 < len(rows):
+                    blocked = True
+                    cast(rows, depth + 1, start, high)
+                    new_start = low
+            if blocked:
+                break
+
+    for rows in _ray_tables(x_radius, y_radius):
+        cast(rows, 0, 1.0, 0.0)
+    visible.flat[lit] = True
+    return visible
+
+def compute_fov(game_map, player_x, player_y, radius, last_direction='s'):
+    """
+    Returns the cells visible from the player as a boolean mask over the
+    window the view ellipse spans, clipped to the map, and the window's origin.
+    """
+    x_radius, y_radius = fov_radii(radius, last_direction)
+    # Only the window the ellipse spans is read, so large maps never build a whole-map mask.
+    transparent, origin_x, origin_y = game_map.transparent_region(player_x - x_radius, player_y - y_radius, player_x + x_radius + 1, player_y + y_radius + 1)
+    return shadowcast(transparent, player_x - origin_x, player_y - origin_y, x_radius, y_radius), origin_x, origin_y
+
+# Rough per-entry cost of the key, tuple and dict slot on top of the mask itself.
+_CACHE_ENTRY_OVERHEAD = 256
+
+class FovCache:
+    """
+    LRU of compute_fov results keyed by (x, y, radius, last_direction), held
+    to max_bytes. A transparency change drops only the entries whose view
+    window covers the changed cell.
+    """
+    def __init__(self, max_bytes=1 << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, settings_manager):
+        if settings_manager is None:
+            return cls()
+        return cls(settings_manager.get_setting("fov_cache_bytes", 1 << 20))
+
+    def compute(self, game_map, player_x, player_y, radius, last_direction='s'):
+        """compute_fov, served from the cache when possible. Cached masks are shared, so treat them as read-only."""
+        key = (player_x, player_y, radius, last_direction)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute_fov(game_map, player_x, player_y, radius, last_direction)
+        result[0].flags.writeable = False
+        self._entries[key] = result
+        self.nbytes += result[0].nbytes + _CACHE_ENTRY_OVERHEAD
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (mask, _, _) = self._entries.popitem(last=False)
+            self.nbytes -= mask.nbytes + _CACHE_ENTRY_OVERHEAD
+        return result
+
+    def invalidate(self, x, y):
+        """Drops every cached view whose window contains (x, y)."""
+        stale = [key for key, (mask, origin_x, origin_y) in self._entries.items()
+                 if 0 <= x - origin_x < mask.shape[1] and 0 <= y - origin_y < mask.shape[0]]
+        for key in stale:
+            mask = self._entries.pop(key)[0]
+            self.nbytes -= mask.nbytes + _CACHE_ENTRY_OVERHEAD
+        self.invalidations += len(stale)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"FOV cache: {self.hits}/{self.hits + self.misses} hits ({self.hit_rate():.0%}), "
+                f"{len(self._entries)} views in {self.nbytes / 1024:.0f} KiB, {self.invalidations} invalidated")
+
+def mask_contains(mask, origin, x, y):
+    """Whether world cell (x, y) is set in a mask whose top-left cell is at origin."""
+    local_x, local_y = x - origin[0], y - origin[1]
+    return 0 <= local_y < mask.shape[0] and 0 <= local_x < mask.shape[1] and bool(mask[local_y, local_x])
@@ -1,6 +1,7 @@
 from ..world.map import Map
 from ..world.tiles import NextMapTile, TrapTile
 from ..world.map_generator import MapGenerator
+from ..world.chunked_map import create_game_map
 from ..utils.logger import Logger 
 
 class InteractionManager:
@@ -14,18 +15,41 @@ class InteractionManager:
 
     def _transition_map(self, message, map_type, entry_direction=None):
         self.game_state.logger.add_message(message)
-        new_grid, room_centers, next_map_tile_pos, player_spawn_pos, room_coords, corridor_coords = MapGenerator.generate_map(
-            self.game_state.game_map.width, self.game_state.game_map.height, map_type, entry_direction, self.game_state
-        )
+        if self.game_state.settings_manager.get_setting("debug_fov_cache_stats", False):
+            self.game_state.logger.add_message(self.game_state.game_map.fov_cache.summary())
+        width, height = self.game_state.game_map.width, self.game_state.game_map.height
+        if self.game_state.settings_manager.get_setting("chunked_world", False):
+            # Chunks are generated on demand, so the new level costs only the chunks around the spawn.
+            self.game_state.game_map = create_game_map(width, height, self.game_state, map_type)
+            self.game_state.game_map.page_around(self.game_state.player.x, self.game_state.player.y)
+            if self.game_state.minimap_menu:
+                self.game_state.minimap_menu.update_map_data(self.game_state.game_map)
+            return
+        pregenerator = self.game_state.level_pregenerator
+        generation = {}  # Filled with the key the level was actually built from
+        if pregenerator:
+            new_grid, room_centers, next_map_tile_pos, player_spawn_pos, room_mask, corridor_mask = pregenerator.take(
+                width, height, map_type, self.game_state.world_seed, self.game_state.dungeon_level, self.game_state, generation
+            )
+            if self.game_state.settings_manager.get_setting("debug_pregeneration_stats", False):
+                self.game_state.logger.add_message(pregenerator.summary())
+        else:
+            new_grid, room_centers, next_map_tile_pos, player_spawn_pos, room_mask, corridor_mask = MapGenerator.generate_map(
+                width, height, map_type, entry_direction, self.game_state, generation=generation
+            )
         self.game_state.game_map = Map(
             self.game_state.game_map.width, self.game_state.game_map.height, map_type=map_type, 
             generate=False, grid=new_grid, room_centers=room_centers, 
-            next_map_tile_pos=next_map_tile_pos, room_coords=room_coords, 
-            corridor_coords=corridor_coords, game_state=self.game_state
+            next_map_tile_pos=next_map_tile_pos, room_mask=room_mask, 
+            corridor_mask=corridor_mask, game_state=self.game_state,
+            generation=generation
         )
         if player_spawn_pos:
             self.game_state.player.x, self.game_state.player.y = player_spawn_pos
-        self.game_state.minimap_menu.update_map_data(self.game_state.game_map)
+        if self.game_state.minimap_menu:  # Headless games have no minimap
+            self.game_state.minimap_menu.update_map_data(self.game_state.game_map)
+        if pregenerator:
+            pregenerator.schedule(width, height, map_type, self.game_state.world_seed, self.game_state.dungeon_level + 1)
 
     def _handle_next_map_tile(self):
         if self.game_state.game_map.current_map_type == "dungeon":
@@ -33,6 +57,13 @@ class InteractionManager:
             self.game_state.logger.add_message(f"Descending to Dungeon Level {self.game_state.dungeon_level}...")
         self._transition_map("Generating new dungeon map...", "dungeon")
 
+    def travel(self):
+        handler = self._tile_interactions.get(type(self.current_interaction_tile))
+        if handler:
+            handler()
+            # The new map has no field of view yet.
+            self.game_state.player.moved = True
+
     def handle_interactions(self):
         player_x, player_y = self.game_state.player.x, self.game_state.player.y
         game_map = self.game_state.game_map
@@ -0,0 +1,107 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ..world.map_generator import MapGenerator, GenerationContext
+from ..world.tile_grid import TileGrid
+
+def _generate_level_payload(width, height, map_type, settings_manager, world_seed, dungeon_level):
+    # Runs in the worker process. Only arrays and small tuples cross back.
+    start = time.perf_counter()
+    context = GenerationContext(settings_manager, world_seed, dungeon_level)
+    generation = {}
+    grid, room_centers, next_map_tile_pos, player_spawn_pos, room_mask, corridor_mask = MapGenerator.generate_map(
+        width, height, map_type, game_state=context, world_seed=world_seed, dungeon_level=dungeon_level, generation=generation
+    )
+    return {
+        "type_ids": grid.type_ids,
+        "room_centers": np.array(room_centers, dtype=np.int32).reshape(-1, 2),
+        "next_map_tile_pos": next_map_tile_pos,
+        "player_spawn_pos": player_spawn_pos,
+        # Bit-packed, the two layers cost a bit per cell each to send back.
+        "room_mask": np.packbits(room_mask),
+        "corridor_mask": np.packbits(corridor_mask),
+        # Built from the settings as they were when the level was scheduled, so the key has to travel with it.
+        "generation": generation,
+        "generation_time": time.perf_counter() - start,
+    }
+
+def _payload_to_level(payload, width, height):
+    grid = TileGrid(width, height, payload["type_ids"])
+    room_centers = [tuple(center) for center in payload["room_centers"].tolist()]
+    room_mask = np.unpackbits(payload["room_mask"], count=width * height).reshape(height, width).astype(bool)
+    corridor_mask = np.unpackbits(payload["corridor_mask"], count=width * height).reshape(height, width).astype(bool)
+    return grid, room_centers, payload["next_map_tile_pos"], payload["player_spawn_pos"], room_mask, corridor_mask
+
+class LevelPregenerator:
+    """
+    Generates the next dungeon level in a worker process while the current one
+    is being played. Generation is deterministic in (world_seed, dungeon_level),
+    so the speculative result is exactly what a synchronous call would build.
+    """
+    def __init__(self, settings_manager):
+        self.settings_manager = settings_manager
+        self.enabled = settings_manager.get_setting("pregenerate_levels", True)
+        self._executor = None
+        self._pending_key = None
+        self._pending = None
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self.last_time_saved = 0.0
+
+    def schedule(self, width, height, map_type, world_seed, dungeon_level):
+        if not self.enabled:
+            return
+        key = (width, height, map_type, world_seed, dungeon_level)
+        if key == self._pending_key:
+            return
+        self._discard_pending()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        self._pending_key = key
+        self._pending = self._executor.submit(
+            _generate_level_payload, width, height, map_type, self.settings_manager, world_seed, dungeon_level
+        )
+
+    def take(self, width, height, map_type, world_seed, dungeon_level, game_state=None, generation=None):
+        """
+        Returns the level for the given key in MapGenerator.generate_map's format.
+        A finished speculative result is adopted; anything else falls back to
+        generating synchronously. generation is filled as by generate_map.
+        """
+        key = (width, height, map_type, world_seed, dungeon_level)
+        if key == self._pending_key and self._pending.done() and self._pending.exception() is None:
+            start = time.perf_counter()
+            payload = self._pending.result()
+            self._pending_key, self._pending = None, None
+            level = _payload_to_level(payload, width, height)
+            if generation is not None:
+                generation.update(payload["generation"])
+            self.hits += 1
+            self.last_time_saved = payload["generation_time"] - (time.perf_counter() - start)
+            self.time_saved += self.last_time_saved
+            return level
+
+        self._discard_pending()
+        self.misses += 1
+        self.last_time_saved = 0.0
+        return MapGenerator.generate_map(width, height, map_type, game_state=game_state, world_seed=world_seed, dungeon_level=dungeon_level, generation=generation)
+
+    def hit_rate(self):
+        transitions = self.hits + self.misses
+        return self.hits / transitions if transitions else 0.0
+
+    def summary(self):
+        return (f"Pregeneration: {self.hits}/{self.hits + self.misses} hits ({self.hit_rate():.0%}), "
+                f"saved {self.last_time_saved * 1000:.0f} ms this transition, {self.time_saved:.2f} s total")
+
+    def _discard_pending(self):
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending_key, self._pending = None, None
+
+    def shutdown(self):
+        self._discard_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
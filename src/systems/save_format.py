@@ -0,0 +1,168 @@
+"""
+Binary save files.
+
+    magic (8 bytes) | format version (u16) | reserved (u16) | index length (u32)
+    index: UTF-8 JSON naming each section's offset, length, codec and layout
+    sections, each starting on an 8-byte boundary; offsets count from the first
+
+A section is either a JSON document or a NumPy array. Boolean arrays are
+stored bit-packed. Each section is compressed on its own, so one can be read
+without touching the others; uncompressed sections are read straight out of a
+memory map with numpy.frombuffer.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # Optional; saves fall back to zlib without it
+    zstandard = None
+
+MAGIC = b"SLOPSAVE"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHHI")
+_ALIGNMENT = 8
+
+def available_codec(codec):
+    """The codec a save will actually be written with: zstd needs the zstandard package."""
+    if codec == "zstd" and zstandard is None:
+        return "zlib"
+    return codec if codec in ("none", "zlib", "zstd") else "zlib"
+
+def _compress(data, codec):
+    if codec == "zlib":
+        return zlib.compress(data, 6)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+def _decompress(data, codec):
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("This save is zstd-compressed; install the zstandard package to load it.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+def _encode_section(value):
+    if isinstance(value, np.ndarray):
+        layout = {"kind": "array", "dtype": value.dtype.str, "shape": list(value.shape)}
+        if value.dtype == bool:
+            layout["bits"] = True
+            return np.packbits(value, axis=None).tobytes(), layout
+        return np.ascontiguousarray(value).tobytes(), layout
+    return json.dumps(value, separators=(",", ":")).encode("utf-8"), {"kind": "json"}
+
+def write_save(path, sections, codec="zlib"):
+    """Writes sections (name -> JSON-ready value or NumPy array) to path atomically. Returns the number of bytes written."""
+    codec = available_codec(codec)
+    payloads, index = [], {}
+    for name, value in sections.items():
+        raw, layout = _encode_section(value)
+        data = _compress(raw, codec)
+        index[name] = dict(layout, codec=codec, length=len(data), raw_length=len(raw))
+        payloads.append((name, data))
+
+    # Offsets count from the first section, so they do not depend on the index's own length.
+    offset = 0
+    for name, data in payloads:
+        index[name]["offset"] = offset
+        offset = _align(offset + len(data))
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    # Written beside the target and renamed over it, so a crash mid-write never leaves a torn save.
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(index_bytes)))
+        f.write(index_bytes)
+        data_start = _align(f.tell())
+        for name, data in payloads:
+            f.seek(data_start + index[name]["offset"])
+            f.write(data)
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return size
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def is_binary_save(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def _read_header(f, path):
+    magic, version, _, index_length = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary save.")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"{path} uses save format {version}; this game reads up to {FORMAT_VERSION}.")
+    return json.loads(f.read(index_length)), _align(_HEADER.size + index_length)
+
+def read_index(path):
+    """Reads only the header and section index of a binary save."""
+    with open(path, "rb") as f:
+        return _read_header(f, path)[0]
+
+def read_json_section(path, name):
+    """Reads one JSON section of a binary save without mapping or decoding the rest; None if the save has no such section."""
+    with open(path, "rb") as f:
+        index, data_start = _read_header(f, path)
+        entry = index.get(name)
+        if entry is None:
+            return None
+        f.seek(data_start + entry["offset"])
+        return json.loads(_decompress(f.read(entry["length"]), entry["codec"]))
+
+class SaveReader:
+    """
+    Read access to a binary save through a memory map. Arrays from
+    uncompressed sections are views of the map and are only valid until
+    close(); copy anything that has to outlive the reader.
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self.index, self._data_start = _read_header(self._file, path)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def _raw(self, name):
+        entry = self.index[name]
+        start = self._data_start + entry["offset"]
+        if entry["codec"] == "none":
+            return memoryview(self._map)[start:start + entry["length"]]
+        return _decompress(self._map[start:start + entry["length"]], entry["codec"])
+
+    def json(self, name):
+        return json.loads(bytes(self._raw(name)))
+
+    def array(self, name):
+        entry = self.index[name]
+        shape = tuple(entry["shape"])
+        if entry.get("bits"):
+            count = int(np.prod(shape))
+            return np.unpackbits(np.frombuffer(self._raw(name), dtype=np.uint8), count=count).astype(bool).reshape(shape)
+        return np.frombuffer(self._raw(name), dtype=np.dtype(entry["dtype"])).reshape(shape)
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            # An array still views the map; it is unmapped when the last view goes away.
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
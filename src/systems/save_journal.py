@@ -0,0 +1,224 @@
+"""
+Append-only autosave journal.
+
+An autosave is a binary snapshot plus a journal file beside it. Each autosave
+between snapshots appends one entry holding only what changed since the last:
+changed player and game fields, newly explored cells, trap state changes and
+changed cells. Loading replays the entries over the snapshot.
+
+    magic (8 bytes) | journal version (u16) | epoch (u64)
+    entries: JSON length (u32) | explored count (u32) | CRC32 (u32) | JSON | explored cell indices (u32 each)
+
+A snapshot records the epoch of the journal started with it, and a journal
+with another epoch is ignored, as is a last entry cut short. A new journal
+only replaces the old one once its snapshot is on disk: until then it is kept
+at <slot>.journal.next and every entry is appended to both, so a crash before
+the snapshot's rename still leaves the old snapshot and a journal that brings
+it up to date. Between that rename and the journal's, loading finds the new
+journal under its .next name.
+"""
+import copy
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from ..world.tiles import FLAG_EXPLORED, FLAG_TRAP_TRIGGERED, FLAG_TRAP_REVEALED
+
+JOURNAL_EXTENSION = ".journal"
+NEXT_SUFFIX = ".next"
+MAGIC = b"SLOPJRNL"
+JOURNAL_VERSION = 1
+_HEADER = struct.Struct("<8sHQ")
+_ENTRY = struct.Struct("<III")
+_TRAP_STATE = FLAG_TRAP_TRIGGERED | FLAG_TRAP_REVEALED
+
+def new_epoch():
+    return time.time_ns()
+
+def start_journal(path, epoch):
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, JOURNAL_VERSION, epoch))
+
+def append_entry(path, changes, explored):
+    """Appends one entry. Returns its size in bytes."""
+    body = json.dumps(changes, separators=(",", ":")).encode("utf-8")
+    cells = np.ascontiguousarray(explored, dtype="<u4").tobytes()
+    record = _ENTRY.pack(len(body), len(explored), zlib.crc32(body + cells)) + body + cells
+    with open(path, "ab") as f:
+        f.write(record)
+    return len(record)
+
+def read_journal(path, epoch):
+    """The journal's entries as (changes, explored) pairs; empty if it is missing or belongs to another snapshot."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    if len(data) < _HEADER.size:
+        return []
+    magic, version, journal_epoch = _HEADER.unpack_from(data)
+    if magic != MAGIC or version > JOURNAL_VERSION or journal_epoch != epoch:
+        return []
+    entries, offset = [], _HEADER.size
+    while offset + _ENTRY.size <= len(data):
+        body_length, explored_count, crc = _ENTRY.unpack_from(data, offset)
+        start = offset + _ENTRY.size
+        end = start + body_length + 4 * explored_count
+        payload = data[start:end]
+        if end > len(data) or zlib.crc32(payload) != crc:
+            break  # Cut short by a crash mid-append
+        entries.append((json.loads(payload[:body_length]), np.frombuffer(payload[body_length:], dtype="<u4")))
+        offset = end
+    return entries
+
+def diff(old, new):
+    """The fields of new that differ from old; nested dicts are compared field by field."""
+    changes = {}
+    for key, value in new.items():
+        if isinstance(value, dict) and isinstance(old.get(key), dict):
+            nested = diff(old[key], value)
+            if nested:
+                changes[key] = nested
+        elif key not in old or old[key] != value:
+            changes[key] = value
+    return changes
+
+def merge(data, changes):
+    """Applies a diff to data in place."""
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            merge(data[key], value)
+        else:
+            data[key] = value
+    return data
+
+def replay_fields(entries, game_data, player_data):
+    """Applies the entries' game and player changes to the snapshot's JSON sections."""
+    for changes, _ in entries:
+        merge(game_data, changes.get("game", {}))
+        merge(player_data, changes.get("player", {}))
+
+def replay_map(entries, game_map):
+    """Applies the entries' cell, trap and exploration changes to a map loaded from the snapshot."""
+    tiles = game_map.tiles
+    for changes, explored in entries:
+        for x, y, type_id in changes.get("modified", []):
+            tiles.set_type(x, y, type_id)
+            game_map.modified_cells.add((x, y))
+        for x, y, state in changes.get("traps", []):
+            tiles.flags[y, x] = (int(tiles.flags[y, x]) & ~_TRAP_STATE) | state
+        ys, xs = np.divmod(explored.astype(np.intp), game_map.width)
+        tiles.flags[ys, xs] |= FLAG_EXPLORED
+
+def read_slot_journal(path, epoch):
+    """The entries for the snapshot with this epoch, from the slot's journal or one not yet moved into place."""
+    return read_journal(path, epoch) or read_journal(path + NEXT_SUFFIX, epoch)
+
+class JournalTracker:
+    """
+    The game as of the last snapshot or journal entry, for working out the
+    next entry. Starts a fresh journal at path for the snapshot whose
+    sections it is given.
+
+    With pending, that snapshot is still being written and the journal at
+    path still belongs to the one before it: the fresh journal waits at
+    path + NEXT_SUFFIX, entries go to both, and the first append or settle()
+    after snapshot_written is set moves it into place. If snapshot_failed is
+    set instead, the fresh journal is dropped, entries go on to the old one
+    and snapshot_due asks for another snapshot.
+    """
+    def __init__(self, path, game_state, sections, epoch, pending=False):
+        self.path = path
+        self.epoch = epoch
+        self.pending = pending
+        self.snapshot_written = threading.Event()
+        self.snapshot_failed = threading.Event()
+        self.snapshot_due = False
+        self.game_map = game_state.game_map
+        self.entries = 0
+        self.bytes_written = 0
+        self._game = copy.deepcopy(sections["game"])
+        self._player = copy.deepcopy(sections["player"])
+        self._modified = self._modified_types()
+        self._traps = self._trap_states()
+        self.game_map.explored_journal = []
+        start_journal(path + NEXT_SUFFIX, epoch)
+        if not pending:
+            os.replace(path + NEXT_SUFFIX, path)
+
+    def _modified_types(self):
+        type_ids = self.game_map.tiles.type_ids
+        return {(x, y): int(type_ids[y, x]) for x, y in self.game_map.modified_cells}
+
+    def _trap_states(self):
+        tiles = self.game_map.tiles
+        ys, xs = np.nonzero(tiles.trap_mask())
+        return dict(zip(zip(xs.tolist(), ys.tolist()), (tiles.flags[ys, xs] & _TRAP_STATE).tolist()))
+
+    def append(self, game_state):
+        """Appends what changed since the last entry. Returns the entry's size in bytes (0 if nothing changed)."""
+        self.settle()
+        changes = {}
+        game, player = game_state._game_fields(), game_state.player.to_dict()
+        game_changes, player_changes = diff(self._game, game), diff(self._player, player)
+        if game_changes:
+            changes["game"] = game_changes
+        if player_changes:
+            changes["player"] = player_changes
+
+        modified = self._modified_types()
+        if modified != self._modified:
+            changes["modified"] = [[x, y, type_id] for (x, y), type_id in sorted(modified.items())
+                                   if self._modified.get((x, y)) != type_id]
+            self._modified = modified
+            # Changed cells may have made or removed traps; everything else only changes trap state.
+            traps = self._trap_states()
+        else:
+            tiles = self.game_map.tiles
+            positions = list(self._traps)
+            xs, ys = (np.array(axis, dtype=np.intp) for axis in zip(*positions)) if positions else ([], [])
+            traps = dict(zip(positions, (tiles.flags[ys, xs] & _TRAP_STATE).tolist()))
+        trap_changes = [[x, y, state] for (x, y), state in traps.items() if self._traps.get((x, y)) != state]
+        if trap_changes:
+            changes["traps"] = trap_changes
+        self._traps = traps
+
+        journal = self.game_map.explored_journal
+        explored = np.concatenate(journal) if journal else np.zeros(0, dtype=np.intp)
+        journal.clear()
+        if not changes and not len(explored):
+            return 0
+
+        self._game, self._player = copy.deepcopy(game), copy.deepcopy(player)
+        if self.pending:
+            # The old journal stays current until the new snapshot replaces the old one.
+            append_entry(self.path, changes, explored)
+            size = append_entry(self.path + NEXT_SUFFIX, changes, explored)
+        else:
+            size = append_entry(self.path, changes, explored)
+        self.entries += 1
+        self.bytes_written += size
+        return size
+
+    def settle(self):
+        """Makes the fresh journal the slot's journal once its snapshot is on disk, or drops it if the write failed."""
+        if not self.pending:
+            return
+        if self.snapshot_written.is_set():
+            os.replace(self.path + NEXT_SUFFIX, self.path)
+            self.pending = False
+        elif self.snapshot_failed.is_set():
+            # The old snapshot and journal are still the slot's, and the old journal has every entry.
+            os.remove(self.path + NEXT_SUFFIX)
+            self.pending = False
+            self.snapshot_due = True
+
+    def close(self):
+        """Stops recording explored cells on the tracked map."""
+        self.game_map.explored_journal = None
@@ -1,11 +1,19 @@
 import json
 import os
+import struct
+import zlib
+from .save_format import write_save, is_binary_save, read_json_section, SaveReader
+from .autosave_writer import AutosaveWriter, snapshot
+from .save_journal import (JOURNAL_EXTENSION, NEXT_SUFFIX, JournalTracker, new_epoch, read_slot_journal,
+                           replay_fields, replay_map)
 from ..world.map import Map
+from ..world.chunked_map import ChunkedMap
 from ..components.player import Player
 from ..ui.ui_manager import UIManager
-from ..game_state import GameState
 
 SAVE_DIR = "saves"
+BINARY_EXTENSION = ".sav"
+LEGACY_EXTENSION = ".json"
 
 class SaveManager:
     def __init__(self, ui_manager: UIManager, settings_manager):
@@ -14,12 +22,24 @@ class SaveManager:
         self.ui_manager = ui_manager
         self.settings_manager = settings_manager
         self._autosave_overwrite_confirmed = None
+        self._autosave_writer = None  # Started by the first background autosave
+        self._journals = {}  # journal path -> JournalTracker of the slot's latest snapshot
+        self._save_info_cache = {}  # save path -> (file versions of the save and its journals, info)
 
-    def _get_save_path(self, filename):
-        return os.path.join(SAVE_DIR, filename + ".json")
+    def _get_save_path(self, filename, extension=BINARY_EXTENSION):
+        return os.path.join(SAVE_DIR, filename + extension)
 
-    def save_game(self, game_state_data, filename, is_autosave=False):
-        save_path = self._get_save_path(filename)
+    def _find_save(self, filename):
+        """The existing file for a save name, preferring the binary one; None if there is neither."""
+        for extension in (BINARY_EXTENSION, LEGACY_EXTENSION):
+            path = self._get_save_path(filename, extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def save_game(self, game_state, filename, is_autosave=False):
+        binary = self.settings_manager.get_setting("save_format", "binary") != "json"
+        save_path = self._get_save_path(filename, BINARY_EXTENSION if binary else LEGACY_EXTENSION)
 
         if is_autosave and filename == "autosave":
             overwrite_behavior = self.settings_manager.get_setting("autosave_overwrite_behavior")
@@ -28,7 +48,7 @@ class SaveManager:
             elif overwrite_behavior == "ask_once":
                 if self._autosave_overwrite_confirmed is False:
                     return "Autosave skipped for this session."
-                elif self._autosave_overwrite_confirmed is None and os.path.exists(save_path):
+                elif self._autosave_overwrite_confirmed is None and self._find_save(filename):
                     confirm = self.ui_manager.get_string(self.ui_manager.stdscr.getmaxyx()[0] - 1, 0, f"Autosave file '{filename}' already exists. Overwrite for this session? (y/n): ").lower()
                     if confirm == 'y':
                         self._autosave_overwrite_confirmed = True
@@ -37,16 +57,68 @@ class SaveManager:
                         return "Autosave skipped for this session."
             # If always_overwrite or confirmed, proceed to save
         else:
-            if os.path.exists(save_path):
+            if self._find_save(filename):
                 max_y, max_x = self.ui_manager.stdscr.getmaxyx()
                 prompt_y = max_y - 1 
                 confirm = self.ui_manager.get_string(prompt_y, 0, f"Save file '{filename}' already exists. Overwrite? (y/n): ").lower()
                 if confirm != 'y':
                     return "Save cancelled."
 
-        with open(save_path, 'w') as f:
-            json.dump(game_state_data, f, indent=4)
-        
+        stale_path = self._get_save_path(filename, LEGACY_EXTENSION if binary else BINARY_EXTENSION)
+        journal_path = self._get_save_path(filename, JOURNAL_EXTENSION)
+        journaled = (is_autosave and binary and isinstance(game_state.game_map, Map)
+                     and self.settings_manager.get_setting("autosave_journal", True))
+        journal = self._journals.pop(journal_path, None)
+        current = journaled and journal is not None and journal.game_map is game_state.game_map
+        if current:
+            # Between snapshots an autosave only appends what changed; a new level or a long journal gets a new
+            # snapshot, though not while the last one is still being written.
+            journal.append(game_state)
+            if journal.pending or (not journal.snapshot_due
+                                   and journal.entries < self.settings_manager.get_setting("autosave_compact_every", 50)):
+                self._journals[journal_path] = journal
+                return "Game Autosaved!"
+        if journal:
+            journal.close()
+
+        sections = game_state.to_sections() if binary else None
+        if journaled:
+            epoch = new_epoch()
+            sections["journal"] = {"epoch": epoch}
+        else:
+            for path in (journal_path, journal_path + NEXT_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        # The old journal has just been brought up to date, so it keeps the old snapshot current until the new one
+        # is on disk. Without one (a first autosave, or a new level) the snapshot is written before returning.
+        if is_autosave and binary and self.settings_manager.get_setting("autosave_async", True) \
+                and (current or not journaled):
+            # Only the snapshot happens here; the writer posts "Game Autosaved!" once the file is on disk.
+            on_written = on_failed = None
+            if journaled:
+                tracker = JournalTracker(journal_path, game_state, sections, epoch, pending=True)
+                self._journals[journal_path] = tracker
+                on_written, on_failed = tracker.snapshot_written.set, tracker.snapshot_failed.set
+            if self._autosave_writer is None:
+                self._autosave_writer = AutosaveWriter()
+            self._autosave_writer.submit(save_path, snapshot(sections),
+                                         self.settings_manager.get_setting("save_compression", "zlib"),
+                                         stale_path, game_state.event_manager, on_written=on_written, on_failed=on_failed)
+            return None
+
+        self.flush_autosaves()  # A queued snapshot must not land on top of this one
+        if binary:
+            write_save(save_path, sections, self.settings_manager.get_setting("save_compression", "zlib"))
+        else:
+            with open(save_path, 'w') as f:
+                json.dump(game_state.to_dict(), f, indent=4)
+        # The save in the other format is now out of date.
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+        if journaled:
+            self._journals[journal_path] = JournalTracker(journal_path, game_state, sections, epoch)
+
         if is_autosave:
             return "Game Autosaved!"
         return f"Game saved to {save_path}"
@@ -54,17 +126,48 @@ class SaveManager:
     def reset_autosave_confirmation(self):
         self._autosave_overwrite_confirmed = None
 
+    @property
+    def autosave_pending(self):
+        return self._autosave_writer is not None and self._autosave_writer.busy
+
+    def flush_autosaves(self):
+        if self._autosave_writer is not None:
+            self._autosave_writer.flush()
+        for journal in self._journals.values():
+            journal.settle()
+
+    def shutdown(self):
+        """Finishes any background autosave; call before the process exits."""
+        if self._autosave_writer is not None:
+            self._autosave_writer.shutdown()
+            self._autosave_writer = None
+        for journal in self._journals.values():
+            journal.settle()
+
     def load_game(self, filename, logger):
-        save_path = self._get_save_path(filename)
-        if not os.path.exists(save_path):
-            logger.add_message(f"Error: Save file {filename}.json not found.")
+        # game_state imports this module, so the import waits until it is first needed.
+        from ..game_state import GameState
+        self.flush_autosaves()  # A background autosave may still be writing this file
+        save_path = self._find_save(filename)
+        if save_path is None:
+            logger.add_message(f"Error: Save file {filename} not found.")
             return None
 
-        with open(save_path, 'r') as f:
-            game_state_data = json.load(f)
-
-        loaded_player = Player.from_dict(game_state_data["player"])
-        loaded_map = Map.from_dict(game_state_data["map"], self.settings_manager) # Pass settings_manager
+        if is_binary_save(save_path):
+            try:
+                with SaveReader(save_path) as save:
+                    game_state_data, loaded_player, loaded_map = self._read_binary(save, self._get_save_path(filename, JOURNAL_EXTENSION))
+            except ValueError as e:
+                logger.add_message(f"Error: Cannot load {filename}: {e}")
+                return None
+        else:
+            with open(save_path, 'r') as f:
+                game_state_data = json.load(f)
+            loaded_player = Player.from_dict(game_state_data["player"])
+            # The oldest saves call the map "map"; GameState.to_dict writes "game_map".
+            map_data = game_state_data.get("game_map") or game_state_data["map"]
+            map_class = ChunkedMap if map_data.get("chunked") else Map
+            loaded_map = map_class.from_dict(map_data, self.settings_manager) # Pass settings_manager
         loaded_map.update_fov(loaded_player)
         
         game_state = GameState.from_dict(game_state_data, self.settings_manager, self, self.ui_manager, logger, player=loaded_player, game_map=loaded_map)
@@ -72,10 +175,78 @@ class SaveManager:
         logger.add_message(f"Game loaded from {save_path}")
         return game_state
 
+    def _read_binary(self, save, journal_path):
+        map_meta = save.json("map")
+        game_data, player_data = save.json("game"), save.json("player")
+        # An autosave snapshot is followed by the journal of the autosaves since.
+        entries = read_slot_journal(journal_path, save.json("journal")["epoch"]) if "journal" in save else []
+        replay_fields(entries, game_data, player_data)
+        # Array sections of an uncompressed save view the memory map; they are released when this returns.
+        layers = {name[len("map."):]: save.array(name) for name in save.index if name.startswith("map.")}
+        map_class = ChunkedMap if map_meta.get("chunked") else Map
+        game_map = map_class.from_layers(map_meta, layers, self.settings_manager)
+        replay_map(entries, game_map)
+        return game_data, Player.from_dict(player_data), game_map
+
+    def list_saves_detailed(self):
+        """
+        One dict per save slot, by name: name, format, size, saved_at and, for
+        binary saves, the metadata section (dungeon level, class, health,
+        play time), brought up to the last journaled autosave. Only each
+        save's header, metadata and journal are read, and only when one of
+        them changed since the last call.
+        """
+        details = []
+        for name in self.list_saves():
+            save_path = self._find_save(name)
+            try:
+                stat = os.stat(save_path)
+            except OSError:
+                continue  # Removed since it was listed
+            journal_path = self._get_save_path(name, JOURNAL_EXTENSION)
+            key = (stat.st_mtime_ns, stat.st_size, _file_version(journal_path), _file_version(journal_path + NEXT_SUFFIX))
+            cached = self._save_info_cache.get(save_path)
+            if cached is None or cached[0] != key:
+                cached = (key, self._read_save_info(name, save_path, stat, journal_path))
+                self._save_info_cache[save_path] = cached
+            details.append(dict(cached[1]))
+        return details
+
+    def _read_save_info(self, name, save_path, stat, journal_path):
+        info = {"name": name, "format": "json", "size": stat.st_size, "saved_at": stat.st_mtime}
+        try:
+            if not is_binary_save(save_path):
+                return info  # Reading anything from a JSON save means parsing all of it
+            info["format"] = "binary"
+            info.update(read_json_section(save_path, "meta") or {})
+            # An autosave's metadata is as of its snapshot; the journal holds the autosaves since.
+            journal = read_json_section(save_path, "journal")
+            entries = read_slot_journal(journal_path, journal["epoch"]) if journal else []
+            if entries:
+                game_data, player_data = {}, {"state": {}}
+                replay_fields(entries, game_data, player_data)
+                info.update((field, game_data[field]) for field in ("dungeon_level", "play_time") if field in game_data)
+                if "health" in player_data["state"]:
+                    info["health"] = player_data["state"]["health"]
+                info["saved_at"] = max(os.path.getmtime(path) for path in (journal_path, journal_path + NEXT_SUFFIX)
+                                       if os.path.exists(path))
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            info["error"] = str(e)
+        return info
+
     def list_saves(self):
-        saves = []
+        saves = set()
         if os.path.exists(SAVE_DIR):
             for filename in os.listdir(SAVE_DIR):
-                if filename.endswith(".json"):
-                    saves.append(filename[:-5])
-        return saves
+                name, extension = os.path.splitext(filename)
+                if extension in (BINARY_EXTENSION, LEGACY_EXTENSION):
+                    saves.add(name)
+        return sorted(saves)
+
+def _file_version(path):
+    """(mtime, size) of a file, or None if there is no such file."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,140 @@
+"""
+Runs many headless games across a process pool, for regression and balance
+testing.
+
+    python -m src.systems.sim_farm --seeds 1000 --classes Swordsman,Mage --commands 2000 --out farm.npz
+    python -m src.systems.sim_farm --seeds 200 --script explore.txt --script stairs.txt --workers 64
+
+Every (seed, class, script) combination is one job. Each worker builds its own
+game, records one row of metrics per turn and sends the rows back as NumPy
+columns through the pool's result pipe. The results file holds one set of
+columns per job and one per turn; "turn_game" gives each turn row's job index.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .simulation import new_headless_game, random_walk, read_script, run_headless, HEADLESS_SETTINGS
+
+TURN_COLUMNS = [("turn", np.int32), ("health", np.int32), ("hunger", np.float32),
+                ("thirst", np.float32), ("dungeon_level", np.int32), ("traps_hit", np.int32)]
+
+class TurnRecorder:
+    """Collects one row of TURN_COLUMNS per finished turn from a game's events."""
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.traps_hit = 0
+        self.rows = {name: [] for name, _ in TURN_COLUMNS}
+        game_state.event_manager.subscribe("turn_end", self._on_turn_end)
+        game_state.event_manager.subscribe("trap_triggered", self._on_trap_triggered)
+
+    def _on_trap_triggered(self, x, y):
+        self.traps_hit += 1
+
+    def _on_turn_end(self, turn):
+        state = self.game_state.player.state
+        rows = self.rows
+        rows["turn"].append(turn)
+        rows["health"].append(state.health)
+        rows["hunger"].append(state.hunger)
+        rows["thirst"].append(state.thirst)
+        rows["dungeon_level"].append(self.game_state.dungeon_level)
+        rows["traps_hit"].append(self.traps_hit)
+
+    def columns(self):
+        return {name: np.array(self.rows[name], dtype=dtype) for name, dtype in TURN_COLUMNS}
+
+# Scripts by name, sent to each worker once when the pool starts rather than with every job.
+_scripts = {}
+
+def _init_worker(scripts):
+    _scripts.update(scripts)
+
+def _play(job):
+    world_seed, player_class_name, script_name, commands, width, height, settings = job
+    script = _scripts[script_name]
+    if script is None:
+        script = random_walk(world_seed, commands)
+    engine = new_headless_game(world_seed, script, width, height, settings, player_class_name)
+    recorder = TurnRecorder(engine.game_state)
+    summary = run_headless(engine)
+    return summary, recorder.columns()
+
+def run_farm(seeds, classes, scripts, commands=2000, width=80, height=24, settings=None, workers=None):
+    """
+    Plays every (seed, class, script) job across a process pool. scripts maps
+    a name to a list of commands, or to None for a seeded random walk of
+    commands steps. Returns a dict of columns ready for numpy.savez_compressed.
+    """
+    jobs = [(world_seed, player_class_name, script_name, commands, width, height, settings)
+            for world_seed in seeds for player_class_name in classes for script_name in scripts]
+    workers = workers or os.cpu_count()
+    # Big chunks keep the pipe traffic to a few messages per worker; several per worker keep the tail short.
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scripts,)) as executor:
+        results = list(executor.map(_play, jobs, chunksize=chunksize))
+
+    summaries, turn_columns = zip(*results) if results else ((), ())
+    corpus = {
+        "world_seeds": np.array([job[0] for job in jobs], dtype=np.int64),
+        "player_classes": np.array([job[1] or "Ordinary Man" for job in jobs]),
+        "scripts": np.array([job[2] for job in jobs]),
+        "turns": np.array([summary["turns"] for summary in summaries], dtype=np.int32),
+        "commands": np.array([summary["commands"] for summary in summaries], dtype=np.int32),
+        "elapsed": np.array([summary["elapsed"] for summary in summaries]),
+        "final_dungeon_level": np.array([summary["dungeon_level"] for summary in summaries], dtype=np.int32),
+        "final_health": np.array([summary["health"] for summary in summaries], dtype=np.int32),
+    }
+    lengths = [len(columns["turn"]) for columns in turn_columns]
+    corpus["turn_game"] = np.repeat(np.arange(len(jobs), dtype=np.int32), lengths)
+    for name, dtype in TURN_COLUMNS:
+        corpus[f"turn_{name}"] = np.concatenate([columns[name] for columns in turn_columns]) if turn_columns else np.zeros(0, dtype=dtype)
+    return corpus
+
+def format_summary(corpus, elapsed, workers):
+    games = len(corpus["world_seeds"])
+    turns = int(corpus["turns"].sum())
+    lines = [f"{games} games, {turns} turns in {elapsed:.2f} s ({turns / elapsed:.0f} turns/s, {workers} workers)"]
+    for player_class_name in np.unique(corpus["player_classes"]):
+        games_of_class = corpus["player_classes"] == player_class_name
+        rows = np.isin(corpus["turn_game"], np.flatnonzero(games_of_class))
+        traps = corpus["turn_traps_hit"][rows]
+        lines.append(f"{player_class_name:<14} health p50 {np.median(corpus['final_health'][games_of_class]):.0f}, "
+                     f"deepest level {corpus['final_dungeon_level'][games_of_class].max()}, "
+                     f"traps hit {int(traps.max()) if len(traps) else 0} max")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play seeded headless games in parallel and write per-turn metrics to an .npz file.")
+    parser.add_argument("--seeds", type=int, default=100, help="number of world seeds")
+    parser.add_argument("--seed", type=int, default=0, help="first world seed")
+    parser.add_argument("--classes", default="Ordinary Man", help="comma-separated player classes")
+    parser.add_argument("--script", action="append", default=[], help="command script file; repeat for several (default: random walk)")
+    parser.add_argument("--commands", type=int, default=2000, help="random-walk commands per game")
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--num-rooms", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--out", default=None, help="results file to write (.npz); omit to only print the summary")
+    args = parser.parse_args(argv)
+
+    classes = [name.strip() for name in args.classes.split(",")]
+    scripts = {os.path.basename(path): read_script(path) for path in args.script} or {"random_walk": None}
+    settings = {**HEADLESS_SETTINGS, "num_rooms": args.num_rooms}
+    workers = args.workers or os.cpu_count()
+    start = time.perf_counter()
+    corpus = run_farm(range(args.seed, args.seed + args.seeds), classes, scripts, args.commands,
+                      args.width, args.height, settings, workers)
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(corpus, elapsed, workers))
+    if args.out:
+        np.savez_compressed(args.out, **corpus)
+        print(f"Wrote {args.out} ({os.path.getsize(args.out) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    sys.exit(main())
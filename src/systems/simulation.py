@@ -0,0 +1,127 @@
+"""
+Headless games, for load tests and balance runs.
+
+    python -m src.systems.simulation --games 20 --commands 5000 --seed 0
+    python -m src.systems.simulation --script moves.txt --player-class Swordsman
+
+Game i is played in world seed seed + i, so any game can be replayed on its
+own. Commands come from a script file (one key or prompt answer per line) or
+from a random walk seeded with the world seed. The game runs through the
+normal GameEngine loop against a NullUIManager, without sleeping.
+"""
+import argparse
+import random
+import sys
+import time
+
+from ..game_engine import GameEngine
+from ..game_state import GameState
+from ..components.player import Player
+from ..ui.null_ui import NullUIManager, ScriptExhausted
+from ..utils.logger import Logger
+from ..world.map_generator import BatchSettings
+from ..world.chunked_map import create_game_map
+from .event_manager import EventManager
+from .save_manager import SaveManager
+
+SYSTEMS = ["commands", "interactions", "effects", "fov", "log", "render"]
+
+# Settings a headless game starts from; anything passed in overrides them.
+HEADLESS_SETTINGS = {
+    "autosave_enabled": False,
+    "pregenerate_levels": False,
+}
+
+def random_walk(seed, count, travel_weight=1):
+    """count movement keys from a seeded generator, with an occasional 'y' to take the stairs."""
+    rng = random.Random(seed)
+    keys = ['w', 'a', 's', 'd', 'y']
+    weights = [4, 4, 4, 4, travel_weight]
+    for _ in range(count):
+        yield rng.choices(keys, weights)[0]
+
+def read_script(path):
+    with open(path, 'r') as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+def new_headless_game(world_seed, commands, width=80, height=24, settings=None, player_class_name=None, record=False):
+    """Builds a GameEngine for a new game in world_seed that reads its input from commands."""
+    settings_manager = BatchSettings({**HEADLESS_SETTINGS, **(settings or {})})
+    ui_manager = NullUIManager(commands, record=record)
+    game_state = GameState(
+        player=Player(0, 0, player_class_name),
+        settings_manager=settings_manager,
+        save_manager=SaveManager(ui_manager, settings_manager),
+        ui_manager=ui_manager,
+        logger=Logger(settings_manager),
+        event_manager=EventManager(),
+    )
+    game_state.event_manager.subscribe("game_message", game_state.logger.add_message)
+    game_state.world_seed = world_seed
+    game_state.game_map = create_game_map(width, height, game_state)
+    engine = GameEngine(game_state)
+    engine.move_cooldown = 0
+    engine.system_times = {}
+    return engine
+
+def run_headless(engine):
+    """Plays the engine's game until its commands run out or it quits. Returns the game's figures."""
+    game_state = engine.game_state
+    start = time.perf_counter()
+    try:
+        engine.run()
+    except ScriptExhausted:
+        pass
+    # Let a background autosave land, and its message reach the log, before reporting.
+    game_state.save_manager.shutdown()
+    game_state.event_manager.dispatch_posted()
+    elapsed = time.perf_counter() - start
+    state = game_state.player.state
+    return {
+        "world_seed": game_state.world_seed,
+        "turns": engine.turns,
+        "commands": game_state.ui_manager.reads,
+        "elapsed": elapsed,
+        "dungeon_level": game_state.dungeon_level,
+        "health": state.health,
+        "hunger": state.hunger,
+        "thirst": state.thirst,
+        "system_times": dict(engine.system_times),
+    }
+
+def format_report(results):
+    turns = sum(result["turns"] for result in results)
+    elapsed = sum(result["elapsed"] for result in results)
+    lines = [f"{len(results)} games, {turns} turns in {elapsed:.2f} s ({turns / elapsed:.0f} turns/s)",
+             f"{'system':<14}{'total ms':>10}{'us/turn':>10}{'share':>8}"]
+    totals = {name: sum(result["system_times"].get(name, 0.0) for result in results) for name in SYSTEMS}
+    for name in SYSTEMS:
+        lines.append(f"{name:<14}{totals[name] * 1000:>10.1f}{totals[name] / max(turns, 1) * 1e6:>10.1f}{totals[name] / elapsed:>8.0%}")
+    deepest = max(result["dungeon_level"] for result in results)
+    lowest = min(result["health"] for result in results)
+    lines.append(f"deepest level {deepest}, lowest health {lowest}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play scripted games without a terminal and report turn throughput.")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="world seed of the first game; game i uses seed + i")
+    parser.add_argument("--commands", type=int, default=2000, help="random-walk commands per game (ignored with --script)")
+    parser.add_argument("--script", default=None, help="file of commands, one per line, played in every game")
+    parser.add_argument("--player-class", default=None)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--num-rooms", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    script = read_script(args.script) if args.script else None
+    results = []
+    for world_seed in range(args.seed, args.seed + args.games):
+        commands = script if script is not None else random_walk(world_seed, args.commands)
+        engine = new_headless_game(world_seed, commands, args.width, args.height,
+                                   {"num_rooms": args.num_rooms}, args.player_class)
+        results.append(run_headless(engine))
+    print(format_report(results))
+
+if __name__ == "__main__":
+    sys.exit(main())
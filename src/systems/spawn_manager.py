@@ -1,4 +1,5 @@
 import random
+import numpy as np
 from ..world.tiles import FloorTile, WallTile, GrassTile, MudTile, RockTile, RubbleTile
 
 class SpawnManager:
@@ -12,26 +13,15 @@ class SpawnManager:
         if preferred_tiles is None:
             preferred_tiles = [FloorTile, GrassTile, MudTile, RockTile, RubbleTile]
 
-        potential_spawns = []
-        height = len(grid)
-        width = len(grid[0]) if height > 0 else 0
+        tiles = grid.tiles
+        suitable = ~tiles.cells_of_type(*avoid_tiles)
+        if preferred_tiles:
+            suitable &= tiles.cells_of_type(*preferred_tiles)
 
-        for y in range(height):
-            for x in range(width):
-                tile = grid[y][x]
-                is_suitable = True
-
-                if any(isinstance(tile, avoid_class) for avoid_class in avoid_tiles):
-                    continue
-
-                if preferred_tiles and not any(isinstance(tile, pref_class) for pref_class in preferred_tiles):
-                    continue
-
-                if self.game_state.player and min_distance_from_player > 0:
-                    distance = ((x - self.game_state.player.x)**2 + (y - self.game_state.player.y)**2)**0.5
-                    if distance < min_distance_from_player:
-                        continue
-
-                potential_spawns.append((x, y))
+        if self.game_state.player and min_distance_from_player > 0:
+            ys, xs = np.ogrid[:tiles.height, :tiles.width]
+            distance_sq = (xs - self.game_state.player.x)**2 + (ys - self.game_state.player.y)**2
+            suitable &= distance_sq >= min_distance_from_player**2
 
+        potential_spawns = tiles.positions(suitable)
         return random.choice(potential_spawns) if potential_spawns else None
@@ -0,0 +1,71 @@
+import heapq
+import itertools
+import time
+
+class Timer:
+    __slots__ = ('deadline', 'callback', 'interval', 'cancelled')
+
+    def __init__(self, deadline, callback, interval):
+        self.deadline = deadline
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class TimerQueue:
+    """
+    One-shot and repeating timers in a heap of deadlines. The game only ever
+    has a few (autosave, stats), so the heap alone says both when the next
+    one is due and which have come due. Cancelled timers stay in the heap
+    until they reach the top.
+    """
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap = []  # (deadline, sequence, timer); the sequence keeps equal deadlines in scheduling order
+        self._sequence = itertools.count()
+
+    def schedule(self, delay, callback, interval=None):
+        """Runs callback after delay seconds, then every interval seconds if one is given."""
+        timer = Timer(self.clock() + delay, callback, interval)
+        self._push(timer)
+        return timer
+
+    def _push(self, timer):
+        heapq.heappush(self._heap, (timer.deadline, next(self._sequence), timer))
+
+    def _drop_cancelled(self):
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+
+    def time_until_next(self, limit=None):
+        """
+        Seconds until the earliest live timer is due (0 if overdue), capped at
+        limit; None if nothing is scheduled and no limit is given.
+        """
+        self._drop_cancelled()
+        if self._heap:
+            wait = max(0.0, self._heap[0][0] - self.clock())
+            return wait if limit is None else min(wait, limit)
+        return limit
+
+    def advance(self):
+        """Runs every timer whose deadline has passed, in deadline order. Returns how many ran."""
+        now = self.clock()
+        heap = self._heap
+        ran = 0
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if timer.cancelled:
+                continue
+            timer.callback()
+            ran += 1
+            if timer.interval and not timer.cancelled:
+                timer.deadline += timer.interval
+                if timer.deadline <= now:
+                    # Fell behind by more than a period; skip the missed runs.
+                    timer.deadline = now + timer.interval
+                self._push(timer)
+        return ran
@@ -0,0 +1,52 @@
+import curses
+
+class FrameBuffer:
+    """
+    Remembers what was last drawn to each screen cell and each text position,
+    and passes only changes on to the curses window. Anything that draws to
+    the window behind the buffer's back (erase, prompts, menus) must call
+    invalidate() so the next frame is drawn in full.
+    """
+    def __init__(self, window):
+        self.window = window
+        self._cells = {}
+        self._text = {}
+        self._text_drawn = set()
+        self.dirty = True
+        self.writes = 0
+
+    def addch(self, y, x, char, attr=0):
+        cell = (char, attr)
+        if self._cells.get((y, x)) == cell:
+            return
+        self._cells[(y, x)] = cell
+        self._write(self.window.addch, y, x, char, attr)
+
+    def addstr(self, y, x, text):
+        self._text_drawn.add((y, x))
+        previous = self._text.get((y, x))
+        if previous == text:
+            return
+        self._text[(y, x)] = text
+        # Blank whatever a longer previous line left behind.
+        self._write(self.window.addstr, y, x, text.ljust(len(previous)) if previous else text)
+
+    def _write(self, draw, *args):
+        try:
+            draw(*args)
+        except curses.error:
+            pass
+        self.dirty = True
+        self.writes += 1
+
+    def end_frame(self):
+        """Blanks text from earlier frames that this frame did not draw again, such as an expired status effect."""
+        for y, x in [position for position in self._text if position not in self._text_drawn]:
+            self._write(self.window.addstr, y, x, ' ' * len(self._text.pop((y, x))))
+        self._text_drawn.clear()
+
+    def invalidate(self):
+        self._cells.clear()
+        self._text.clear()
+        self._text_drawn.clear()
+        self.dirty = True
@@ -1,4 +1,5 @@
-from ..world.map import Map
+from ..world.chunked_map import create_game_map
+from ..world.seeding import new_world_seed
 from ..components.player import Player
 from ..systems.settings_manager import SettingsManager
 from .ui_manager import UIManager
@@ -58,12 +59,14 @@ class Menu:
         
         player = Player(0, 0)
         self.game_state.player = player
+        self.game_state.world_seed = new_world_seed()
 
-        dungeon_map = Map(self.map_width, self.map_height, map_type="dungeon", game_state=self.game_state)
+        dungeon_map = create_game_map(self.map_width, self.map_height, self.game_state)
         self.game_state.game_map = dungeon_map
         self.game_state.game_map.update_fov(self.game_state.player)
 
         self.game_state.minimap_menu = MinimapMenu(self.game_state)
+        self._pregenerate_next_level()
 
         self.game_state.is_running = True
         self.game_state.current_menu = None
@@ -71,7 +74,7 @@ class Menu:
         return "start_game"
 
     def load_game(self):
-        available_saves = self.game_state.save_manager.list_saves()
+        available_saves = self.game_state.save_manager.list_saves_detailed()
         self.game_state.ui_manager.display_save_screen(available_saves)
 
         max_y, max_x = self.game_state.ui_manager.stdscr.getmaxyx()
@@ -94,6 +97,11 @@ class Menu:
             self.game_state.game_map = loaded_game_state.game_map
             self.game_state.game_map.game_state = loaded_game_state
             self.game_state.game_map.update_fov(self.game_state.player)
+            self.game_state.dungeon_level = loaded_game_state.dungeon_level
+            self.game_state.world_seed = loaded_game_state.world_seed
+            self.game_state.play_time = loaded_game_state.play_time
+            self.game_state.session_start = loaded_game_state.session_start
+            self._pregenerate_next_level()
             self.game_state.is_running = True
             self.game_state.current_menu = None
 
@@ -102,5 +110,13 @@ class Menu:
             self.game_state.logger.add_message(f"Failed to load game: {filename}")
             return None
 
+    def _pregenerate_next_level(self):
+        # Chunked worlds are generated lazily, a chunk at a time; there is nothing to pre-build.
+        if self.game_state.level_pregenerator and not self.game_state.settings_manager.get_setting("chunked_world", False):
+            game_map = self.game_state.game_map
+            self.game_state.level_pregenerator.schedule(
+                game_map.width, game_map.height, "dungeon", self.game_state.world_seed, self.game_state.dungeon_level + 1
+            )
+
     def open_settings(self):
         return False
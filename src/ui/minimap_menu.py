@@ -1,6 +1,7 @@
 import curses
+import numpy as np
 from .themes import COLOR_PAIR_FLOOR, COLOR_PAIR_WALL, COLOR_PAIR_EXPLORED, COLOR_PAIR_NEXT_MAP_TILE, COLOR_PAIR_DEFAULT, COLOR_PAIR_GRASS, COLOR_PAIR_MUD, COLOR_PAIR_ROCK, COLOR_PAIR_RUBBLE, COLOR_PAIR_CORRIDOR
-from ..world.tiles import WallTile, NextMapTile, TrapTile, FloorTile, GrassTile, MudTile, RockTile, RubbleTile
+from ..world.tiles import WallTile, NextMapTile, TrapTile, FloorTile, GrassTile, MudTile, RockTile, RubbleTile, WALL_GLYPHS
 
 class MinimapMenu:
     def __init__(self, game_state):
@@ -18,42 +19,52 @@ class MinimapMenu:
         self.x_scale = max(1, game_map.width // ui_manager.camera_width)
         self.y_scale = max(1, game_map.height // ui_manager.camera_height)
 
-        self.minimap_grid = [[{'char': ' ', 'color': curses.color_pair(COLOR_PAIR_DEFAULT), 'explored': False} for _ in range(ui_manager.camera_width)] for _ in range(ui_manager.camera_height)]
+        self.minimap_grid = [[{'char': ' ', 'color': curses.color_pair(COLOR_PAIR_DEFAULT), 'explored': False, 'wall': False} for _ in range(ui_manager.camera_width)] for _ in range(ui_manager.camera_height)]
 
         for my in range(len(self.minimap_grid)):
             for mx in range(len(self.minimap_grid[0])):
                 start_x, start_y = mx * self.x_scale, my * self.y_scale
                 block_tiles = []
-                for y_offset in range(self.y_scale):
-                    for x_offset in range(self.x_scale):
-                        map_x, map_y = start_x + x_offset, start_y + y_offset
-                        if 0 <= map_x < game_map.width and 0 <= map_y < game_map.height:
-                            block_tiles.append((game_map.grid[map_y][map_x], map_x, map_y))
+                # A chunked world only shows what is resident; nothing else is paged in for the minimap.
+                if game_map.any_loaded(start_x, start_y, start_x + self.x_scale, start_y + self.y_scale):
+                    for y_offset in range(self.y_scale):
+                        for x_offset in range(self.x_scale):
+                            map_x, map_y = start_x + x_offset, start_y + y_offset
+                            if 0 <= map_x < game_map.width and 0 <= map_y < game_map.height and game_map.is_loaded(map_x, map_y):
+                                block_tiles.append((game_map.grid[map_y][map_x], map_x, map_y))
 
-                char, color_pair, is_explored = ' ', curses.color_pair(COLOR_PAIR_DEFAULT), False
+                char, color_pair, is_explored, is_wall = ' ', curses.color_pair(COLOR_PAIR_DEFAULT), False, False
                 tile_types = {type(t) for t, _, _ in block_tiles}
-                coords = {(tx, ty) for _, tx, ty in block_tiles}
 
                 if NextMapTile in tile_types:
                     char, color_pair = 'X', curses.color_pair(COLOR_PAIR_NEXT_MAP_TILE)
-                elif coords & game_map.room_coords:
+                elif any(game_map.is_room(tx, ty) for _, tx, ty in block_tiles):
                     char, color_pair = '█', curses.color_pair(COLOR_PAIR_FLOOR)
-                elif coords & game_map.corridor_coords:
+                elif any(game_map.is_corridor(tx, ty) for _, tx, ty in block_tiles):
                     char, color_pair = '.', curses.color_pair(COLOR_PAIR_CORRIDOR)
                 elif WallTile in tile_types:
-                    char, color_pair = '#', curses.color_pair(COLOR_PAIR_WALL)
+                    # The glyph of the block's first wall, from the map's wall glyph layer.
+                    wall_x, wall_y = next((tx, ty) for t, tx, ty in block_tiles if isinstance(t, WallTile))
+                    char, color_pair, is_wall = WALL_GLYPHS[game_map.tiles.wall_code_at(wall_x, wall_y)], curses.color_pair(COLOR_PAIR_WALL), True
                 elif any(t in tile_types for t in [FloorTile, GrassTile, MudTile, RockTile, RubbleTile]):
                     char, color_pair = '.', curses.color_pair(COLOR_PAIR_FLOOR)
                 
                 if any(t.is_explored for t, _, _ in block_tiles):
                     is_explored = True
 
-                self.minimap_grid[my][mx] = {'char': char, 'color': color_pair, 'explored': is_explored}
+                self.minimap_grid[my][mx] = {'char': char, 'color': color_pair, 'explored': is_explored, 'wall': is_wall}
 
-    def update_minimap_explored_status(self, map_x, map_y):
-        mm_x, mm_y = map_x // self.x_scale, map_y // self.y_scale
-        if 0 <= mm_y < len(self.minimap_grid) and 0 <= mm_x < len(self.minimap_grid[0]):
-            self.minimap_grid[mm_y][mm_x]['explored'] = True
+    def update_map_data(self, game_map):
+        # game_map is already the game state's current map; rebuild from it.
+        self._generate_initial_minimap_grid()
+
+    def update_explored_region(self, explored, origin_x, origin_y):
+        """Marks the minimap cells covering the set cells of explored, a mask whose top-left map cell is (origin_x, origin_y)."""
+        ys, xs = np.nonzero(explored)
+        cells = set(zip(((ys + origin_y) // self.y_scale).tolist(), ((xs + origin_x) // self.x_scale).tolist()))
+        for mm_y, mm_x in cells:
+            if 0 <= mm_y < len(self.minimap_grid) and 0 <= mm_x < len(self.minimap_grid[0]):
+                self.minimap_grid[mm_y][mm_x]['explored'] = True
 
     def display(self):
         self.game_state.ui_manager.clear_screen()
@@ -65,7 +76,7 @@ class MinimapMenu:
             for mx, cell in enumerate(row):
                 char, color = ('@', curses.color_pair(COLOR_PAIR_DEFAULT)) if my == player_mm_y and mx == player_mm_x else (cell['char'], cell['color'])
                 if not cell['explored']:
-                    char, color = ('#', curses.color_pair(COLOR_PAIR_EXPLORED)) if cell['char'] == '#' else (' ', color)
+                    char, color = (cell['char'], curses.color_pair(COLOR_PAIR_EXPLORED)) if cell['wall'] else (' ', color)
                 
                 try:
                     ui_manager.stdscr.addch(my + 2, mx, char, color)
@@ -0,0 +1,83 @@
+class ScriptExhausted(Exception):
+    """Raised by NullUIManager when the game asks for input after its script has run out."""
+
+class _NullWindow:
+    """Accepts the stdscr calls the game makes outside UIManager and draws nothing."""
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+class NullUIManager:
+    """
+    A UIManager that draws nothing and reads its input from an iterable of
+    commands, so the game can run without a terminal. Keys and answers to
+    prompts (save names, menu choices) come from the same script, in order.
+    With record set, prompts and messages are kept in transcript.
+    """
+    def __init__(self, commands, camera_width=80, camera_height=24, record=False):
+        self.stdscr = _NullWindow(camera_height + 12, camera_width + 30)
+        self.camera_width = camera_width
+        self.camera_height = camera_height
+        self.record = record
+        self.transcript = []
+        self.reads = 0
+        self._commands = iter(commands)
+
+    def _next_command(self):
+        try:
+            command = next(self._commands)
+        except StopIteration:
+            raise ScriptExhausted() from None
+        self.reads += 1
+        return command
+
+    def _record(self, kind, text):
+        if self.record:
+            self.transcript.append((kind, text))
+
+    def wait_for_key(self, timeout=None):
+        return self._next_command()
+
+    def get_key_if_available(self):
+        return self._next_command()
+
+    def get_string(self, y, x, prompt=""):
+        answer = self._next_command()
+        self._record("prompt", f"{prompt}{answer}")
+        return answer
+
+    def display_message(self, y, x, message):
+        self._record("message", message)
+
+    def display_menu(self, menu_options, title=None):
+        self._record("menu", title)
+
+    def display_save_screen(self, saves):
+        self._record("saves", ", ".join(save["name"] for save in saves))
+
+    def init_ui(self):
+        pass
+
+    def clear_screen(self):
+        pass
+
+    def invalidate_frame(self):
+        pass
+
+    def display_map(self, game_map, player, game_state):
+        pass
+
+    def display_player_stats(self, player, game_state):
+        pass
+
+    def display_log(self, messages, game_state):
+        pass
+
+    def refresh(self):
+        pass
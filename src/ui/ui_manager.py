@@ -1,5 +1,8 @@
 import curses
+import math
+import time
 from ..world.tiles import TrapTile, FloorTile, GrassTile, MudTile, RockTile, RubbleTile
+from .frame_buffer import FrameBuffer
 from .themes import init_colors, COLOR_PAIR_FLOOR, COLOR_PAIR_DEFAULT, COLOR_PAIR_EXPLORED, COLOR_PAIR_WALL, COLOR_PAIR_GRASS, COLOR_PAIR_MUD, COLOR_PAIR_ROCK, COLOR_PAIR_RUBBLE, COLOR_PAIR_NEXT_MAP_TILE, COLOR_PAIR_UNEXPLORED
 
 class UIManager:
@@ -8,6 +11,10 @@ class UIManager:
         self.stdscr.keypad(True)
         self.camera_width = camera_width
         self.camera_height = camera_height
+        # The game world is drawn through the frame buffer, so unchanged cells cost nothing.
+        self.frame = FrameBuffer(stdscr)
+        self._map_view = None
+        self._map_view_objects = None
         # self.stdscr.nodelay(True) # Make getkey() blocking
 
     def init_ui(self):
@@ -18,6 +25,11 @@ class UIManager:
 
     def clear_screen(self):
         self.stdscr.erase()
+        self.invalidate_frame()
+
+    def invalidate_frame(self):
+        self.frame.invalidate()
+        self._map_view = None
 
     def display_message(self, y, x, message):
         try:
@@ -25,12 +37,21 @@ class UIManager:
         except curses.error:
             pass
 
+    def wait_for_key(self, timeout=None):
+        """Blocks until a key arrives or timeout seconds pass (forever if None), then behaves like get_key_if_available."""
+        # Rounded up: waking before the deadline would find nothing due and wait again with a zero timeout.
+        self.stdscr.timeout(-1 if timeout is None else max(0, math.ceil(timeout * 1000)))
+        return self.get_key_if_available()
+
     def get_key_if_available(self):
         key_code = self.stdscr.getch()
 
         if key_code == -1:
             return None  # No input
 
+        if key_code == curses.KEY_RESIZE:
+            self.invalidate_frame()
+
         # A key was pressed. Immediately flush the rest of the input buffer
         # to prevent the "ghost movement" lag.
         curses.flushinp()
@@ -54,11 +75,15 @@ class UIManager:
             return str(key_code)
 
     def get_string(self, y, x, prompt=""):
+        # The prompt is drawn over whatever is on screen, outside the frame buffer.
+        self.invalidate_frame()
         self.stdscr.addstr(y, x, prompt)
         self.stdscr.noutrefresh()
         curses.doupdate()
 
         s = ""
+        # The game loop may have left a read timeout set; prompts always wait for the player.
+        self.stdscr.timeout(-1)
         curses.curs_set(1)
         max_y, max_x = self.stdscr.getmaxyx()
         prompt_len = len(prompt)
@@ -92,14 +117,27 @@ class UIManager:
         camera_x = max(0, min(player.x - self.camera_width // 2, game_map.width - self.camera_width))
         camera_y = max(0, min(player.y - self.camera_height // 2, game_map.height - self.camera_height))
 
+        # Nothing on the map can change without the player moving, the view being
+        # recomputed or a tile changing type.
+        view = (id(game_map), id(game_map.visible_mask), game_map.tiles.version, player.x, player.y, camera_x, camera_y)
+        if view == self._map_view:
+            return
+        if self._map_view is None:
+            # First frame after a menu, prompt or resize: clear whatever they left on screen.
+            self.stdscr.erase()
+            self.frame.invalidate()
+        self._map_view = view
+        # Holding the objects keeps their ids from being reused while they are compared.
+        self._map_view_objects = (game_map, game_map.visible_mask)
+
         for y in range(self.camera_height):
             for x in range(self.camera_width):
                 map_x, map_y = camera_x + x, camera_y + y
                 tile = game_map.grid[map_y][map_x]
-                is_visible = (map_x, map_y) in game_map.visible_tiles
+                is_visible = game_map.is_visible(map_x, map_y)
                 is_player_on = (map_x, map_y) == (player.x, player.y)
                 
-                tile.render(self.stdscr, y, x, is_visible, is_player_on, game_state, map_x, map_y)
+                tile.render(self.frame, y, x, is_visible, is_player_on, game_state, map_x, map_y)
 
     def display_player_stats(self, player, game_state):
         # Calculate starting X position for stats on the right side
@@ -108,68 +146,73 @@ class UIManager:
         state = player.state # Get the state object for easier access
 
         # Basic Stats
-        self.display_message(current_y, stats_start_x, "--- Player Stats ---")
+        self.frame.addstr(current_y, stats_start_x, "--- Player Stats ---")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Class: {player.player_class_name or 'Ordinary Man'}")
+        self.frame.addstr(current_y, stats_start_x, f"Class: {player.player_class_name or 'Ordinary Man'}")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Health: {state.health}/{state.max_health}")
+        self.frame.addstr(current_y, stats_start_x, f"Health: {state.health}/{state.max_health}")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Mana: {state.mana}/{state.max_mana}")
+        self.frame.addstr(current_y, stats_start_x, f"Mana: {state.mana}/{state.max_mana}")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Stamina: {state.stamina}/{state.max_stamina}")
+        self.frame.addstr(current_y, stats_start_x, f"Stamina: {state.stamina}/{state.max_stamina}")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Attack: {state.attack}")
+        self.frame.addstr(current_y, stats_start_x, f"Attack: {state.attack}")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Defense: {state.defense}")
+        self.frame.addstr(current_y, stats_start_x, f"Defense: {state.defense}")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Level: {state.level}")
+        self.frame.addstr(current_y, stats_start_x, f"Level: {state.level}")
         current_y += 1
 
         # Vitals
         current_y += 1 
-        self.display_message(current_y, stats_start_x, "--- Vitals ---")
+        self.frame.addstr(current_y, stats_start_x, "--- Vitals ---")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Hunger: {state.hunger:.0f}%")
+        self.frame.addstr(current_y, stats_start_x, f"Hunger: {state.hunger:.0f}%")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Thirst: {state.thirst:.0f}%")
+        self.frame.addstr(current_y, stats_start_x, f"Thirst: {state.thirst:.0f}%")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Comfort: {state.comfort}%")
+        self.frame.addstr(current_y, stats_start_x, f"Comfort: {state.comfort}%")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Heartrate: {state.heartrate} BPM")
+        self.frame.addstr(current_y, stats_start_x, f"Heartrate: {state.heartrate} BPM")
         current_y += 1
-        self.display_message(current_y, stats_start_x, f"Weight: {state.weight_carried:.1f} lbs")
+        self.frame.addstr(current_y, stats_start_x, f"Weight: {state.weight_carried:.1f} lbs")
         current_y += 1
 
         # Status Effects
         effects = player.get_status_effects()
         if effects:
             current_y += 1
-            self.display_message(current_y, stats_start_x, "--- Effects ---")
+            self.frame.addstr(current_y, stats_start_x, "--- Effects ---")
             current_y += 1
             for effect in effects:
-                self.display_message(current_y, stats_start_x, f"- {effect}")
+                self.frame.addstr(current_y, stats_start_x, f"- {effect}")
                 current_y += 1
 
         # Dungeon Level (if applicable)
         if game_state and game_state.game_map and game_state.game_map.current_map_type == "dungeon":
             current_y += 1 # Add a blank line for separation
-            self.display_message(current_y, stats_start_x, f"Dungeon Level: {game_state.dungeon_level}")
+            self.frame.addstr(current_y, stats_start_x, f"Dungeon Level: {game_state.dungeon_level}")
 
     def display_log(self, messages, game_state):
         y_offset = 1
-        self.display_message(self.camera_height + y_offset, 0, "--- Log ---")
+        self.frame.addstr(self.camera_height + y_offset, 0, "--- Log ---")
         for i, msg in enumerate(messages):
-            self.display_message(self.camera_height + y_offset + 1 + i, 0, msg)
-        self.display_message(self.camera_height + y_offset + len(messages) + 1, 0, "-----------")
+            self.frame.addstr(self.camera_height + y_offset + 1 + i, 0, msg)
+        self.frame.addstr(self.camera_height + y_offset + len(messages) + 1, 0, "-----------")
 
     def display_save_screen(self, saves):
+        """Lists saves from SaveManager.list_saves_detailed, newest first, as many as fit above the prompt."""
         self.clear_screen()
         self.display_message(1, 0, "--- Available Saves ---")
         if not saves:
             self.display_message(3, 0, "No saves found.")
         else:
-            for i, save_name in enumerate(saves):
-                self.display_message(3 + i, 0, f"- {save_name}")
+            saves = sorted(saves, key=lambda save: save["saved_at"], reverse=True)
+            rows = max(1, self.camera_height - 3)
+            for i, save in enumerate(saves[:rows]):
+                self.display_message(3 + i, 0, _save_line(save))
+            if len(saves) > rows:
+                self.display_message(3 + rows, 0, f"  ... and {len(saves) - rows} more")
         self.display_message(self.camera_height + 1, 0, "Enter filename to save or load (or 'b' to go back):")
 
     def display_menu(self, menu_options, title=None):
@@ -181,4 +224,17 @@ class UIManager:
             self.display_message(y_offset + i, 0, f"{key}. {value}")
 
     def refresh(self):
-        curses.doupdate()
\ No newline at end of file
+        # Batch the frame's writes into one terminal update, and skip it when nothing changed.
+        self.frame.end_frame()
+        if self.frame.dirty:
+            self.stdscr.noutrefresh()
+            curses.doupdate()
+            self.frame.dirty = False
+
+def _save_line(save):
+    saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(save["saved_at"]))
+    if save["format"] != "binary" or "dungeon_level" not in save:
+        return f"- {save['name']:<20} {saved_at}  (no details: {save.get('error', 'old save format')})"
+    minutes = save["play_time"] // 60
+    return (f"- {save['name']:<20} {saved_at}  level {save['dungeon_level']:<3} "
+            f"{save['player_class'] or 'Ordinary Man':<14} HP {save['health']:<4} played {minutes // 60}:{minutes % 60:02d}")
@@ -0,0 +1,97 @@
+"""
+Headless batch map generation, for stress runs and building map corpora.
+
+    python -m src.world.batchgen --count 200 --width 200 --height 200 --num-rooms 80 --out corpus.npz
+
+Map i is generated from (seed + i, dungeon_level), so any map in a corpus can
+be regenerated on its own with MapGenerator.generate_map.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .map_generator import MapGenerator, GenerationContext, BatchSettings
+from .seeding import GENERATOR_VERSION
+
+PHASES = ["rooms", "mst", "ca", "water", "river", "tiles", "placement", "traps"]
+PERCENTILES = [50, 90, 99]
+
+def _generate(width, height, map_type, settings, world_seed, dungeon_level):
+    phase_times = {}
+    start = time.perf_counter()
+    context = GenerationContext(BatchSettings(settings), world_seed, dungeon_level)
+    grid, room_centers, next_map_tile_pos, player_spawn_pos, _, _ = MapGenerator.generate_map(
+        width, height, map_type, game_state=context, world_seed=world_seed, dungeon_level=dungeon_level, phase_times=phase_times
+    )
+    total = time.perf_counter() - start
+    return grid.type_ids, len(room_centers), next_map_tile_pos or (-1, -1), player_spawn_pos or (-1, -1), phase_times, total
+
+def generate_batch(count, width, height, settings, seed=0, dungeon_level=1, map_type="dungeon", workers=None):
+    """
+    Generates count maps across a process pool. Returns a dict of stacked
+    arrays, in seed order, ready to be written with numpy.savez_compressed.
+    """
+    seeds = np.arange(seed, seed + count, dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_generate, width, height, map_type, settings, int(world_seed), dungeon_level) for world_seed in seeds]
+        results = [future.result() for future in futures]
+
+    type_ids, room_counts, next_map_tiles, spawns, phase_times, totals = zip(*results)
+    return {
+        "type_ids": np.stack(type_ids),
+        "world_seeds": seeds,
+        "dungeon_level": np.int64(dungeon_level),
+        "room_counts": np.array(room_counts, dtype=np.int32),
+        "next_map_tile_pos": np.array(next_map_tiles, dtype=np.int32),
+        "player_spawn_pos": np.array(spawns, dtype=np.int32),
+        "phases": np.array(PHASES),
+        "phase_times": np.array([[times.get(phase, 0.0) for phase in PHASES] for times in phase_times]),
+        "total_times": np.array(totals),
+        "generator_version": np.int64(GENERATOR_VERSION),
+    }
+
+def format_timings(corpus):
+    columns = [f"p{p}" for p in PERCENTILES] + ["max"]
+    lines = [f"{'phase':<10}" + "".join(f"{column:>10}" for column in columns) + "   (ms)"]
+    rows = list(zip(PHASES, corpus["phase_times"].T)) + [("total", corpus["total_times"])]
+    for name, times in rows:
+        values = list(np.percentile(times, PERCENTILES)) + [times.max()]
+        lines.append(f"{name:<10}" + "".join(f"{value * 1000:>10.2f}" for value in values))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate maps in parallel and write them to an .npz corpus.")
+    parser.add_argument("--count", type=int, default=100, help="number of maps to generate")
+    parser.add_argument("--seed", type=int, default=0, help="world seed of the first map; map i uses seed + i")
+    parser.add_argument("--dungeon-level", type=int, default=1)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=24)
+    parser.add_argument("--num-rooms", type=int, default=20)
+    parser.add_argument("--min-room-size", type=int, default=5)
+    parser.add_argument("--max-room-size", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--out", default=None, help="corpus file to write (.npz); omit to only report timings")
+    args = parser.parse_args(argv)
+
+    settings = {
+        "num_rooms": args.num_rooms,
+        "min_room_size": args.min_room_size,
+        "max_room_size": args.max_room_size,
+    }
+    start = time.perf_counter()
+    corpus = generate_batch(args.count, args.width, args.height, settings, args.seed, args.dungeon_level, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"Generated {args.count} {args.width}x{args.height} maps in {elapsed:.2f} s "
+          f"({args.count / elapsed:.1f} maps/s, {args.workers or os.cpu_count()} workers)")
+    print(format_timings(corpus))
+    if args.out:
+        np.savez_compressed(args.out, **corpus)
+        print(f"Wrote {args.out} ({os.path.getsize(args.out) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import numpy as np
+
+def count_neighbors(mask, include_center=False):
+    """
+    Counts set cells in the 3x3 neighbourhood of every interior cell.
+    Works on the last two axes, so a stack of masks is counted in one pass.
+    Border cells are left at zero, matching the generators which never
+    touch the outer ring of the map.
+    """
+    m = mask.astype(np.uint8)
+    counts = np.zeros(m.shape, dtype=np.uint8)
+    # Separable 3x3 box sum: horizontal triples, then vertical triples of those.
+    rows = m[..., :, :-2] + m[..., :, 1:-1] + m[..., :, 2:]
+    box = rows[..., :-2, :] + rows[..., 1:-1, :] + rows[..., 2:, :]
+    if not include_center:
+        box -= m[..., 1:-1, 1:-1]
+    counts[..., 1:-1, 1:-1] = box
+    return counts
+
+def apply_majority_vote(codes, terrain_codes, iterations=1):
+    """
+    Replaces every interior terrain cell with the terrain type most common
+    among its 8 neighbours. Ties go to the earliest entry in terrain_codes,
+    and a cell with no terrain neighbours becomes terrain_codes[0].
+    Non-terrain cells (walls, water) are left untouched.
+    """
+    terrain = np.asarray(terrain_codes, dtype=codes.dtype)
+    interior = np.zeros(codes.shape, dtype=bool)
+    interior[1:-1, 1:-1] = True
+
+    for _ in range(iterations):
+        one_hot = codes[np.newaxis, :, :] == terrain[:, np.newaxis, np.newaxis]
+        counts = count_neighbors(one_hot)
+        # argmax returns the first maximum, which preserves the tie-breaking order.
+        winners = terrain[counts.argmax(axis=0)]
+        update = interior & one_hot.any(axis=0)
+        codes = np.where(update, winners, codes)
+    return codes
+
+def dilate(mask, low, high):
+    """
+    Grows a boolean mask by every (dx, dy) offset with both components in
+    range(low, high). The square structuring element is separable, so this
+    runs as one pass per axis instead of one stamp per set cell.
+    """
+    result = mask
+    for axis in (0, 1):
+        size = result.shape[axis]
+        grown = np.zeros_like(result)
+        for offset in range(low, high):
+            if abs(offset) >= size:
+                continue
+            dst = [slice(None), slice(None)]
+            src = [slice(None), slice(None)]
+            if offset >= 0:
+                dst[axis], src[axis] = slice(offset, size), slice(0, size - offset)
+            else:
+                dst[axis], src[axis] = slice(0, size + offset), slice(-offset, size)
+            grown[tuple(dst)] |= result[tuple(src)]
+        result = grown
+    return result
@@ -0,0 +1,364 @@
+import base64
+import random
+import zlib
+from collections import OrderedDict
+import numpy as np
+from .map import Map, MapGrid
+from .levels.dungeon_level import DungeonLevel
+from .seeding import level_rngs, seed_value
+from .tile_grid import TileGrid
+from .tiles import TILE_CLASSES, WallTile, WALL_UP, WALL_DOWN, WALL_LEFT, WALL_RIGHT, FLAG_WALKABLE, FLAG_TRANSPARENT, FLAG_EXPLORED, FLAG_TRAP_TRIGGERED, FLAG_TRAP_REVEALED
+from ..systems.fov import FovCache, mask_contains
+
+# Per-cell flags that change during play and have to survive a chunk being paged out.
+STATE_FLAGS = FLAG_EXPLORED | FLAG_TRAP_TRIGGERED | FLAG_TRAP_REVEALED
+
+# Keys for the seed streams of a chunked level, so they never collide with each other.
+_CHUNK_STREAM, _VERTICAL_DOOR_STREAM, _HORIZONTAL_DOOR_STREAM, _LAYOUT_STREAM = range(4)
+
+class Chunk:
+    __slots__ = ('tiles', 'room_centers', 'room_mask', 'corridor_mask', 'types_modified')
+
+    def __init__(self, tiles, room_centers, room_mask, corridor_mask):
+        self.tiles = tiles
+        self.room_centers = room_centers
+        self.room_mask = room_mask
+        self.corridor_mask = corridor_mask
+        self.types_modified = False
+
+class ChunkedTiles:
+    """
+    The per-cell part of the TileGrid interface, in world coordinates, routed
+    to the chunk holding each cell. Tile views read and write through this.
+    Reads of a cell outside the resident chunks see an unexplored wall and
+    page nothing in; writes page the cell's chunk in.
+    """
+    __slots__ = ('world', 'version')
+
+    def __init__(self, world):
+        self.world = world
+        # Counts type changes across all chunks, like TileGrid.version.
+        self.version = 0
+
+    def _locate(self, x, y):
+        size = self.world.chunk_size
+        return self.world.chunk(x // size, y // size), x % size, y % size
+
+    def _locate_resident(self, x, y):
+        size = self.world.chunk_size
+        return self.world.resident_chunk(x // size, y // size), x % size, y % size
+
+    def type_id_at(self, x, y):
+        chunk, local_x, local_y = self._locate_resident(x, y)
+        return chunk.tiles.type_ids[local_y, local_x]
+
+    def get_flag(self, x, y, flag):
+        chunk, local_x, local_y = self._locate_resident(x, y)
+        return chunk.tiles.get_flag(local_x, local_y, flag)
+
+    def set_flag(self, x, y, flag, value=True):
+        chunk, local_x, local_y = self._locate(x, y)
+        chunk.tiles.set_flag(local_x, local_y, flag, value)
+
+    def set_type(self, x, y, tile_type):
+        chunk, local_x, local_y = self._locate(x, y)
+        was_transparent = chunk.tiles.get_flag(local_x, local_y, FLAG_TRANSPARENT)
+        chunk.tiles.set_type(local_x, local_y, tile_type)
+        chunk.types_modified = True
+        self.version += 1
+        if chunk.tiles.get_flag(local_x, local_y, FLAG_TRANSPARENT) != was_transparent:
+            self.world.fov_cache.invalidate(x, y)
+
+    def character_at(self, x, y):
+        chunk, local_x, local_y = self._locate_resident(x, y)
+        return chunk.tiles.character_at(local_x, local_y)
+
+    def wall_code_at(self, x, y):
+        chunk, local_x, local_y = self._locate_resident(x, y)
+        code = int(chunk.tiles.wall_code_at(local_x, local_y))
+        if chunk.tiles.type_ids[local_y, local_x] != WallTile.tile_type.type_id:
+            return code
+        # Each chunk's layer sees only its own cells; walls on a chunk edge pick up
+        # their neighbours across it here, from chunks that are already resident.
+        world, last = self.world, self.world.chunk_size - 1
+        for bit, on_edge, nx, ny in ((WALL_UP, local_y == 0, x, y - 1), (WALL_DOWN, local_y == last, x, y + 1),
+                                     (WALL_LEFT, local_x == 0, x - 1, y), (WALL_RIGHT, local_x == last, x + 1, y)):
+            if not on_edge or not (0 <= nx < world.width and 0 <= ny < world.height) or not world.is_loaded(nx, ny):
+                continue
+            if self.type_id_at(nx, ny) == WallTile.tile_type.type_id:
+                code |= bit
+        return code
+
+    def layer_at(self, x, y, layer):
+        chunk, local_x, local_y = self._locate_resident(x, y)
+        return bool(getattr(chunk, layer)[local_y, local_x])
+
+class ChunkedMap:
+    """
+    A dungeon level split into chunk_size x chunk_size chunks that are
+    generated on first use from (world_seed, dungeon_level, chunk x, chunk y).
+    At most max_resident_chunks are held in memory, least recently used first
+    out; a paged-out chunk is regenerated from its seed and only its play
+    state (explored and trap flags, plus tile changes) is kept, compressed.
+    Width and height are rounded up to whole chunks.
+    """
+    def __init__(self, width, height, world_seed, dungeon_level, settings_manager, map_type="dungeon", game_state=None, chunk_size=None, max_resident_chunks=None):
+        self.chunk_size = chunk_size or settings_manager.get_setting("chunk_size", 64)
+        self.max_resident_chunks = max_resident_chunks or settings_manager.get_setting("max_resident_chunks", 36)
+        self.resident_radius = settings_manager.get_setting("resident_chunk_radius", 2)
+        self.chunks_x = -(-width // self.chunk_size)
+        self.chunks_y = -(-height // self.chunk_size)
+        self.width = self.chunks_x * self.chunk_size
+        self.height = self.chunks_y * self.chunk_size
+        self.world_seed = world_seed
+        self.dungeon_level = dungeon_level
+        self.settings_manager = settings_manager
+        self.current_map_type = map_type
+        self.game_state = game_state
+        self.visible_mask = np.zeros((0, 0), dtype=bool)
+        self.visible_origin = (0, 0)
+        self._view_key = None
+        self.fov_cache = FovCache.from_settings(settings_manager)
+        self.next_map_tile_pos = None
+        self.tiles = ChunkedTiles(self)
+        self._resident = OrderedDict()
+        self._paged_out_state = {}
+        # What reads of a non-resident cell see: unexplored solid wall, with no rooms.
+        self._unloaded = Chunk(TileGrid(self.chunk_size, self.chunk_size), [],
+                               np.zeros((self.chunk_size, self.chunk_size), dtype=bool),
+                               np.zeros((self.chunk_size, self.chunk_size), dtype=bool))
+
+        layout_rng = random.Random(seed_value(world_seed, dungeon_level, _LAYOUT_STREAM))
+        self.spawn_chunk = (self.chunks_x // 2, self.chunks_y // 2)
+        other_chunks = [(cx, cy) for cy in range(self.chunks_y) for cx in range(self.chunks_x) if (cx, cy) != self.spawn_chunk]
+        self.exit_chunk = layout_rng.choice(other_chunks) if other_chunks else self.spawn_chunk
+
+        if game_state and game_state.player:
+            game_state.player.x, game_state.player.y = self.spawn_position()
+
+    @property
+    def grid(self):
+        return MapGrid(self)
+
+    @property
+    def room_centers(self):
+        return [center for chunk in self._resident.values() for center in chunk.room_centers]
+
+    def spawn_position(self):
+        cx, cy = self.spawn_chunk
+        chunk = self.chunk(cx, cy)
+        if chunk.room_centers:
+            return chunk.room_centers[0]
+        return cx * self.chunk_size + self.chunk_size // 2, cy * self.chunk_size + self.chunk_size // 2
+
+    def is_loaded(self, x, y):
+        return (x // self.chunk_size, y // self.chunk_size) in self._resident
+
+    def any_loaded(self, x0, y0, x1, y1):
+        """Whether any cell of [x0, x1) x [y0, y1) is in a resident chunk."""
+        size = self.chunk_size
+        return any(x0 // size <= cx <= (x1 - 1) // size and y0 // size <= cy <= (y1 - 1) // size for cx, cy in self._resident)
+
+    def is_room(self, x, y):
+        return self.tiles.layer_at(x, y, 'room_mask')
+
+    def is_corridor(self, x, y):
+        return self.tiles.layer_at(x, y, 'corridor_mask')
+
+    def resident_chunks(self):
+        return list(self._resident)
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        chunk = self._resident.get(key)
+        if chunk is None:
+            chunk = self._load_chunk(cx, cy)
+            self._resident[key] = chunk
+            while len(self._resident) > self.max_resident_chunks:
+                self._page_out(*self._resident.popitem(last=False))
+        else:
+            self._resident.move_to_end(key)
+        return chunk
+
+    def resident_chunk(self, cx, cy):
+        """The chunk if it is resident, else the unloaded placeholder; never pages."""
+        return self._resident.get((cx, cy), self._unloaded)
+
+    def page_around(self, x, y):
+        """Makes the chunks within resident_radius of (x, y) resident, nearest last so they stay longest."""
+        center_x, center_y = x // self.chunk_size, y // self.chunk_size
+        radius = self.resident_radius
+        nearby = [(cx, cy) for cy in range(center_y - radius, center_y + radius + 1) for cx in range(center_x - radius, center_x + radius + 1)
+                  if 0 <= cx < self.chunks_x and 0 <= cy < self.chunks_y]
+        nearby.sort(key=lambda key: -max(abs(key[0] - center_x), abs(key[1] - center_y)))
+        for cx, cy in nearby:
+            self.chunk(cx, cy)
+
+    def _doors(self, cx, cy):
+        # Each shared edge gets one door whose offset both neighbours derive from the same seed.
+        size, doors = self.chunk_size, []
+        def offset(stream, edge_x, edge_y):
+            return 2 + seed_value(self.world_seed, self.dungeon_level, stream, edge_x, edge_y) % (size - 4)
+        if cx > 0:
+            doors.append((0, offset(_VERTICAL_DOOR_STREAM, cx - 1, cy)))
+        if cx < self.chunks_x - 1:
+            doors.append((size - 1, offset(_VERTICAL_DOOR_STREAM, cx, cy)))
+        if cy > 0:
+            doors.append((offset(_HORIZONTAL_DOOR_STREAM, cx, cy - 1), 0))
+        if cy < self.chunks_y - 1:
+            doors.append((offset(_HORIZONTAL_DOOR_STREAM, cx, cy), size - 1))
+        return doors
+
+    def _load_chunk(self, cx, cy):
+        size = self.chunk_size
+        rng, np_rng = level_rngs(self.world_seed, self.dungeon_level, _CHUNK_STREAM, cx, cy)
+        level = DungeonLevel(size, size, rng, np_rng)
+        tiles = TileGrid(size, size)
+        settings = self.settings_manager
+        room_centers, next_map_tile_pos = level.generate_chunk(
+            tiles, settings.get_setting("chunk_num_rooms", 6), settings.get_setting("min_room_size", 5), settings.get_setting("max_room_size", 10),
+            self._doors(cx, cy), has_exit=(cx, cy) == self.exit_chunk
+        )
+        origin_x, origin_y = cx * size, cy * size
+        if next_map_tile_pos:
+            self.next_map_tile_pos = (origin_x + next_map_tile_pos[0], origin_y + next_map_tile_pos[1])
+
+        state = self._paged_out_state.pop((cx, cy), None)
+        if state:
+            type_ids, flags = state
+            if type_ids is not None:
+                tiles.set_types(_unpack(type_ids, size))
+            tiles.flags |= _unpack(flags, size)
+
+        return Chunk(
+            tiles,
+            [(origin_x + x, origin_y + y) for x, y in room_centers],
+            level.room_mask,
+            level.corridor_mask,
+        )
+
+    def _page_out(self, key, chunk):
+        state = chunk.tiles.flags & STATE_FLAGS
+        if chunk.types_modified or state.any():
+            type_ids = _pack(chunk.tiles.type_ids) if chunk.types_modified else None
+            self._paged_out_state[key] = (type_ids, _pack(state))
+
+    def tile_at(self, x, y):
+        return TILE_CLASSES[self.tiles.type_id_at(x, y)](self, x, y)
+
+    def set_tile(self, x, y, tile):
+        self.tiles.set_type(x, y, tile)
+
+    def _chunk_windows(self, x0, y0, x1, y1):
+        # Splits the window [x0, x1) x [y0, y1) by resident chunk, yielding each
+        # with the overlap's slices into the window and into the chunk. Cells in
+        # chunks that are not resident are skipped rather than paged in.
+        size = self.chunk_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                if (cx, cy) not in self._resident:
+                    continue
+                left, top = max(x0, cx * size), max(y0, cy * size)
+                right, bottom = min(x1, (cx + 1) * size), min(y1, (cy + 1) * size)
+                yield (self._resident[(cx, cy)],
+                       (slice(top - y0, bottom - y0), slice(left - x0, right - x0)),
+                       (slice(top - cy * size, bottom - cy * size), slice(left - cx * size, right - cx * size)))
+
+    def transparent_region(self, x0, y0, x1, y1):
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        region = np.zeros((max(y1 - y0, 0), max(x1 - x0, 0)), dtype=bool)
+        for chunk, window, local in self._chunk_windows(x0, y0, x1, y1):
+            region[window] = (chunk.tiles.flags[local] & FLAG_TRANSPARENT) != 0
+        return region, x0, y0
+
+    def merge_explored(self, mask, x0, y0):
+        added = np.zeros_like(mask)
+        for chunk, window, local in self._chunk_windows(x0, y0, x0 + mask.shape[1], y0 + mask.shape[0]):
+            added[window] = chunk.tiles.merge_flag_window(FLAG_EXPLORED, mask[window], local[1].start, local[0].start)
+        return added
+
+    def is_visible(self, x, y):
+        return mask_contains(self.visible_mask, self.visible_origin, x, y)
+
+    def update_fov(self, player):
+        self.page_around(player.x, player.y)
+        view_key = (player.x, player.y, player.last_direction, self.tiles.version)
+        if view_key == self._view_key:
+            return
+        self._view_key = view_key
+        self.visible_mask, origin_x, origin_y = self.fov_cache.compute(self, player.x, player.y, radius=6, last_direction=player.last_direction)
+        self.visible_origin = (origin_x, origin_y)
+        newly_explored = self.merge_explored(self.visible_mask, origin_x, origin_y)
+        if self.game_state and self.game_state.minimap_menu and newly_explored.any():
+            self.game_state.minimap_menu.update_explored_region(newly_explored, origin_x, origin_y)
+
+    def get_random_room_center(self):
+        room_centers = self.room_centers
+        if not room_centers:
+            return self.spawn_position()
+        return random.choice(room_centers)
+
+    def get_tile_type(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tiles.character_at(x, y)
+        return '#'
+
+    def is_wall(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return not self.tiles.get_flag(x, y, FLAG_WALKABLE)
+        return True
+
+    def to_dict(self):
+        for key, chunk in self._resident.items():
+            self._page_out(key, chunk)
+        chunk_state = {}
+        for (cx, cy), (type_ids, flags) in self._paged_out_state.items():
+            chunk_state[f"{cx},{cy}"] = {
+                "type_ids": base64.b64encode(type_ids).decode('ascii') if type_ids is not None else None,
+                "flags": base64.b64encode(flags).decode('ascii'),
+            }
+        # Resident chunks stay in memory; drop the copies taken for saving.
+        for key in self._resident:
+            self._paged_out_state.pop(key, None)
+        return {
+            "chunked": True,
+            "width": self.width,
+            "height": self.height,
+            "chunk_size": self.chunk_size,
+            "world_seed": self.world_seed,
+            "dungeon_level": self.dungeon_level,
+            "current_map_type": self.current_map_type,
+            "chunk_state": chunk_state,
+        }
+
+    @classmethod
+    def from_dict(cls, data, settings_manager):
+        game_map = cls(data["width"], data["height"], data["world_seed"], data["dungeon_level"], settings_manager,
+                       map_type=data.get("current_map_type", "dungeon"), chunk_size=data["chunk_size"])
+        for key, state in data.get("chunk_state", {}).items():
+            cx, cy = map(int, key.split(","))
+            type_ids = base64.b64decode(state["type_ids"]) if state["type_ids"] else None
+            game_map._paged_out_state[(cx, cy)] = (type_ids, base64.b64decode(state["flags"]))
+        return game_map
+
+    def to_layers(self, delta=False):
+        # Already a seed plus per-chunk explored/trap state, whatever delta says.
+        return self.to_dict(), {}
+
+    @classmethod
+    def from_layers(cls, meta, layers, settings_manager):
+        return cls.from_dict(meta, settings_manager)
+
+def _pack(array):
+    return zlib.compress(np.ascontiguousarray(array, dtype=np.uint8).tobytes())
+
+def _unpack(data, size):
+    return np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(size, size)
+
+def create_game_map(width, height, game_state, map_type="dungeon"):
+    """Builds the map for the current level: chunked when the chunked_world setting is on."""
+    settings_manager = game_state.settings_manager
+    if settings_manager.get_setting("chunked_world", False):
+        return ChunkedMap(width, height, game_state.world_seed, game_state.dungeon_level, settings_manager, map_type=map_type, game_state=game_state)
+    return Map(width, height, map_type=map_type, game_state=game_state)
@@ -1,10 +1,18 @@
+import random
+import numpy as np
 from abc import ABC, abstractmethod
 
 class Level(ABC):
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, np_rng=None):
         self.width = width
         self.height = height
+        # Every random draw made while building the level goes through these,
+        # so a level is reproducible from the generators it was given.
+        self.rng = rng if rng is not None else random.Random()
+        self.np_rng = np_rng if np_rng is not None else np.random.default_rng()
+        # Optional PhaseProfiler; None keeps generation free of instrumentation.
+        self.profiler = None
 
     @abstractmethod
-    def generate_map(self, grid, room_centers, next_map_tile_pos, game_state=None):
+    def generate_map(self, grid, room_centers, next_map_tile_pos, game_state=None, settings=None):
         pass
@@ -1,46 +1,161 @@
+import base64
 import random
+import zlib
+import numpy as np
 from .map_generator import MapGenerator
-from .tile_factory import create_tile_from_dict
-from ..systems.fov import compute_fov
+from .tile_factory import tile_type_from_dict
+from .tiles import TILE_CLASSES, FLAG_WALKABLE, FLAG_TRANSPARENT, FLAG_EXPLORED, FLAG_TRAP_TRIGGERED, FLAG_TRAP_REVEALED
+from .tile_grid import TileGrid
+from .seeding import GENERATOR_VERSION
+from ..systems.fov import FovCache, mask_contains
+
+class MapRow:
+    __slots__ = ('game_map', 'y')
+
+    def __init__(self, game_map, y):
+        self.game_map = game_map
+        self.y = y
+
+    def __getitem__(self, x):
+        return self.game_map.tile_at(x, self.y)
+
+    def __setitem__(self, x, tile):
+        self.game_map.set_tile(x, self.y, tile)
+
+    def __len__(self):
+        return self.game_map.width
+
+    def __iter__(self):
+        for x in range(self.game_map.width):
+            yield self.game_map.tile_at(x, self.y)
+
+class MapGrid:
+    """
+    Keeps `game_map.grid[y][x]` working on top of the map's type-id array.
+    Each access returns a short-lived Tile view bound to that cell.
+    """
+    __slots__ = ('game_map',)
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+
+    @property
+    def tiles(self):
+        return self.game_map.tiles
+
+    def __getitem__(self, y):
+        return MapRow(self.game_map, y)
+
+    def __len__(self):
+        return self.game_map.height
+
+    def __iter__(self):
+        for y in range(self.game_map.height):
+            yield MapRow(self.game_map, y)
 
 class Map:
-    def __init__(self, width, height, map_type="dungeon", generate=True, entry_direction=None, game_state=None, grid=None, room_centers=None, next_map_tile_pos=None, room_coords=None, corridor_coords=None):
+    def __init__(self, width, height, map_type="dungeon", generate=True, entry_direction=None, game_state=None, grid=None, room_centers=None, next_map_tile_pos=None, room_mask=None, corridor_mask=None, generation=None):
         self.width = width
         self.height = height
         self.current_map_type = map_type
-        self.visible_tiles = set()
+        # Cells in view, as a mask over the window at visible_origin.
+        self.visible_mask = np.zeros((0, 0), dtype=bool)
+        self.visible_origin = (0, 0)
+        # What the current view was computed from; see update_fov.
+        self._view_key = None
+        self.fov_cache = FovCache.from_settings(game_state.settings_manager if game_state else None)
         self.game_state = game_state
-        self.room_coords = set()
-        self.corridor_coords = set()
+        self.room_mask = np.zeros((height, width), dtype=bool)
+        self.corridor_mask = np.zeros((height, width), dtype=bool)
 
         if generate:
-            self.grid, self.room_centers, self.next_map_tile_pos, _, self.room_coords, self.corridor_coords = MapGenerator.generate_map(width, height, map_type, entry_direction, game_state)
+            generation = {}
+            self.grid, self.room_centers, self.next_map_tile_pos, _, self.room_mask, self.corridor_mask = MapGenerator.generate_map(width, height, map_type, entry_direction, game_state, generation=generation)
         elif grid is not None:
             self.grid = grid
             self.room_centers = room_centers if room_centers is not None else []
             self.next_map_tile_pos = next_map_tile_pos
-            self.room_coords = room_coords if room_coords is not None else set()
-            self.corridor_coords = corridor_coords if corridor_coords is not None else set()
+            if room_mask is not None:
+                self.room_mask = room_mask
+            if corridor_mask is not None:
+                self.corridor_mask = corridor_mask
         else:
-            from .tiles import WallTile
-            self.grid = [[WallTile() for _ in range(width)] for _ in range(height)]
+            self.grid = TileGrid(width, height)
             self.room_centers = []
             self.next_map_tile_pos = None
+        # How to rebuild the generated terrain from its seed, with a checksum of
+        # that terrain; None if the map did not come from the generator. Saves
+        # then only need the cells changed since (see to_layers).
+        self.generation = dict(generation, checksum=_checksum(self.tiles.type_ids)) if generation else None
+        self.modified_cells = set()
+        # When a list, merge_explored appends the flat indices of newly explored cells (for the autosave journal).
+        self.explored_journal = None
+
+    @property
+    def grid(self):
+        return MapGrid(self)
+
+    @grid.setter
+    def grid(self, tiles):
+        # Generators hand over a TileGrid; anything else is treated as a type-id array.
+        if isinstance(tiles, TileGrid):
+            self.tiles = tiles
+        else:
+            self.tiles = TileGrid(self.width, self.height, tiles)
+
+    def tile_at(self, x, y):
+        return TILE_CLASSES[self.tiles.type_ids[y, x]](self, x, y)
+
+    def set_tile(self, x, y, tile):
+        was_transparent = self.tiles.get_flag(x, y, FLAG_TRANSPARENT)
+        self.tiles.set_type(x, y, tile)
+        self.modified_cells.add((x, y))
+        if self.tiles.get_flag(x, y, FLAG_TRANSPARENT) != was_transparent:
+            self.fov_cache.invalidate(x, y)
+
+    def transparent_region(self, x0, y0, x1, y1):
+        """Transparency of the cells in [x0, x1) x [y0, y1), clipped to the map, and its origin."""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        return (self.tiles.flags[y0:y1, x0:x1] & FLAG_TRANSPARENT) != 0, x0, y0
+
+    def is_loaded(self, x, y):
+        return True
+
+    def any_loaded(self, x0, y0, x1, y1):
+        return True
+
+    def is_room(self, x, y):
+        return bool(self.room_mask[y, x])
+
+    def is_corridor(self, x, y):
+        return bool(self.corridor_mask[y, x])
+
+    def is_visible(self, x, y):
+        return mask_contains(self.visible_mask, self.visible_origin, x, y)
+
+    def merge_explored(self, mask, x0, y0):
+        """Marks the cells set in mask, at (x0, y0), explored and returns the newly explored ones."""
+        added = self.tiles.merge_flag_window(FLAG_EXPLORED, mask, x0, y0)
+        if self.explored_journal is not None:
+            ys, xs = np.nonzero(added)
+            self.explored_journal.append((ys + y0) * self.width + xs + x0)
+        return added
 
     def update_fov(self, player):
-        self.visible_tiles.clear()
         if self.current_map_type == "dungeon":
-            self.visible_tiles = compute_fov(self, player.x, player.y, radius=6, last_direction=player.last_direction)
-            for x, y in self.visible_tiles:
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    if not self.grid[y][x].is_explored:
-                        self.grid[y][x].is_explored = True
-                        if self.game_state and self.game_state.minimap_menu:
-                            self.game_state.minimap_menu.update_minimap_explored_status(x, y)
+            # The view only changes when the player moves or turns, or the terrain changes.
+            view_key = (player.x, player.y, player.last_direction, self.tiles.version)
+            if view_key == self._view_key:
+                return
+            self._view_key = view_key
+            self.visible_mask, origin_x, origin_y = self.fov_cache.compute(self, player.x, player.y, radius=6, last_direction=player.last_direction)
+            self.visible_origin = (origin_x, origin_y)
+            newly_explored = self.merge_explored(self.visible_mask, origin_x, origin_y)
+            if self.game_state and self.game_state.minimap_menu and newly_explored.any():
+                self.game_state.minimap_menu.update_explored_region(newly_explored, origin_x, origin_y)
         else:
-            for y in range(self.height):
-                for x in range(self.width):
-                    self.visible_tiles.add((x, y))
+            self.visible_mask, self.visible_origin = np.ones((self.height, self.width), dtype=bool), (0, 0)
 
     def to_dict(self):
         grid_data = [[tile.to_dict() for tile in row] for row in self.grid]
@@ -51,9 +166,51 @@ class Map:
             "room_centers": self.room_centers,
             "next_map_tile_pos": self.next_map_tile_pos,
             "current_map_type": self.current_map_type,
-            "room_coords": list(self.room_coords),
-            "corridor_coords": list(self.corridor_coords)
+            # Stored so loading does not have to rebuild the wall glyph layer.
+            "wall_codes": _encode_layer(self.tiles.wall_codes),
+            "room_coords": TileGrid.positions(self.room_mask),
+            "corridor_coords": TileGrid.positions(self.corridor_mask)
+        }
+
+    def to_layers(self, delta=False):
+        """
+        The map as JSON-ready metadata plus its per-cell layers as arrays, for
+        binary saves. With delta set, a generated map stores only its
+        generation key and what changed since: explored cells, trap state and
+        modified cells.
+        """
+        trap_ys, trap_xs = np.nonzero(self.tiles.trap_mask())
+        trap_state = self.tiles.flags[trap_ys, trap_xs] & (FLAG_TRAP_TRIGGERED | FLAG_TRAP_REVEALED)
+        modified = np.array([(x, y, self.tiles.type_ids[y, x]) for x, y in sorted(self.modified_cells)], dtype=np.int32).reshape(-1, 3)
+        if delta and self.generation:
+            touched = trap_state != 0
+            meta = {"width": self.width, "height": self.height, "current_map_type": self.current_map_type, "generation": self.generation}
+            layers = {
+                "explored": self.tiles.explored_mask(),
+                "traps": np.stack([trap_xs[touched], trap_ys[touched], trap_state[touched]]).T.astype(np.int32),
+                "modified": modified,
+            }
+            return meta, layers
+        meta = {
+            "width": self.width,
+            "height": self.height,
+            "room_centers": self.room_centers,
+            "next_map_tile_pos": self.next_map_tile_pos,
+            "current_map_type": self.current_map_type,
+            "generation": self.generation,
+        }
+        layers = {
+            "type_ids": self.tiles.type_ids,
+            "wall_codes": self.tiles.wall_codes,
+            "explored": self.tiles.explored_mask(),
+            "room_mask": self.room_mask,
+            "corridor_mask": self.corridor_mask,
+            # Sparse: only trap cells carry state beyond what the type implies.
+            "traps": np.stack([trap_xs, trap_ys, trap_state]).T.astype(np.int32),
+            # Kept so a later delta save still knows which cells differ from the generated terrain.
+            "modified": modified,
         }
+        return meta, layers
 
     def get_random_room_center(self):
         if not self.room_centers:
@@ -62,21 +219,87 @@ class Map:
 
     def get_tile_type(self, x, y):
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x].character
+            return self.tiles.character_at(x, y)
         return '#'
 
     def is_wall(self, x, y):
         if 0 <= x < self.width and 0 <= y < self.height:
-            return not self.grid[y][x].is_walkable
+            return not self.tiles.get_flag(x, y, FLAG_WALKABLE)
         return True
 
     @classmethod
     def from_dict(cls, data, settings_manager):
         map_type = data.get("current_map_type", "dungeon")
         game_map = cls(data["width"], data["height"], map_type=map_type, generate=False)
-        game_map.grid = [[create_tile_from_dict(tile_data) for tile_data in row_data] for row_data in data["grid"]]
+        game_map.fov_cache = FovCache.from_settings(settings_manager)
+        type_ids = [[tile_type_from_dict(tile_data).type_id for tile_data in row_data] for row_data in data["grid"]]
+        wall_codes = _decode_layer(data["wall_codes"], game_map.width, game_map.height) if data.get("wall_codes") else None
+        game_map.grid = TileGrid(game_map.width, game_map.height, type_ids, wall_codes)
+        explored = np.array([[tile_data.get("is_explored", False) for tile_data in row_data] for row_data in data["grid"]], dtype=bool)
+        game_map.tiles.set_flag_mask(FLAG_EXPLORED, explored)
+        for x, y in game_map.tiles.positions(game_map.tiles.trap_mask()):
+            tile_data = data["grid"][y][x]
+            game_map.tiles.set_flag(x, y, FLAG_TRAP_TRIGGERED, tile_data.get("is_triggered", False))
+            game_map.tiles.set_flag(x, y, FLAG_TRAP_REVEALED, tile_data.get("is_revealed", False))
         game_map.room_centers = data["room_centers"]
         game_map.next_map_tile_pos = tuple(data["next_map_tile_pos"]) if data["next_map_tile_pos"] else None
-        game_map.room_coords = set(map(tuple, data.get("room_coords", [])))
-        game_map.corridor_coords = set(map(tuple, data.get("corridor_coords", [])))
+        game_map.room_mask = _coords_to_mask(data.get("room_coords", []), game_map.width, game_map.height)
+        game_map.corridor_mask = _coords_to_mask(data.get("corridor_coords", []), game_map.width, game_map.height)
         return game_map
+
+    @classmethod
+    def from_layers(cls, meta, layers, settings_manager):
+        if "type_ids" not in layers:
+            return cls._from_generation(meta, layers, settings_manager)
+        game_map = cls(meta["width"], meta["height"], map_type=meta.get("current_map_type", "dungeon"), generate=False)
+        game_map.fov_cache = FovCache.from_settings(settings_manager)
+        game_map.grid = TileGrid(game_map.width, game_map.height, layers["type_ids"], layers["wall_codes"])
+        game_map.room_centers = [tuple(center) for center in meta["room_centers"]]
+        game_map.next_map_tile_pos = tuple(meta["next_map_tile_pos"]) if meta["next_map_tile_pos"] else None
+        game_map.room_mask = np.array(layers["room_mask"], dtype=bool)
+        game_map.corridor_mask = np.array(layers["corridor_mask"], dtype=bool)
+        game_map.generation = meta.get("generation")
+        if "modified" in layers:
+            game_map.modified_cells = {(x, y) for x, y, _ in np.asarray(layers["modified"]).tolist()}
+        game_map._apply_state(layers)
+        return game_map
+
+    @classmethod
+    def _from_generation(cls, meta, layers, settings_manager):
+        generation = meta["generation"]
+        if generation["generator_version"] != GENERATOR_VERSION:
+            raise ValueError(f"This save needs map generator version {generation['generator_version']}; this game has version {GENERATOR_VERSION}.")
+        grid, room_centers, next_map_tile_pos, _, room_mask, corridor_mask = MapGenerator.regenerate(generation)
+        if _checksum(grid.type_ids) != generation["checksum"]:
+            raise ValueError("The map generator no longer rebuilds this save's terrain; its checksum does not match.")
+        game_map = cls(meta["width"], meta["height"], map_type=meta.get("current_map_type", "dungeon"), generate=False,
+                       grid=grid, room_centers=room_centers, next_map_tile_pos=next_map_tile_pos,
+                       room_mask=room_mask, corridor_mask=corridor_mask)
+        game_map.fov_cache = FovCache.from_settings(settings_manager)
+        game_map.generation = generation
+        for x, y, type_id in np.asarray(layers["modified"]).tolist():
+            game_map.tiles.set_type(x, y, type_id)
+            game_map.modified_cells.add((x, y))
+        game_map._apply_state(layers)
+        return game_map
+
+    def _apply_state(self, layers):
+        self.tiles.set_flag_mask(FLAG_EXPLORED, layers["explored"])
+        trap_xs, trap_ys, trap_state = np.asarray(layers["traps"]).T
+        self.tiles.flags[trap_ys, trap_xs] |= trap_state.astype(np.uint8)
+
+def _checksum(type_ids):
+    return zlib.crc32(np.ascontiguousarray(type_ids, dtype=np.uint8).tobytes())
+
+def _encode_layer(layer):
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(layer, dtype=np.uint8).tobytes())).decode('ascii')
+
+def _decode_layer(data, width, height):
+    return np.frombuffer(zlib.decompress(base64.b64decode(data)), dtype=np.uint8).reshape(height, width)
+
+def _coords_to_mask(coords, width, height):
+    mask = np.zeros((height, width), dtype=bool)
+    if len(coords):
+        xs, ys = np.asarray(coords, dtype=np.intp).T
+        mask[ys, xs] = True
+    return mask
@@ -1,6 +1,26 @@
-import random
 from .levels.dungeon_level import DungeonLevel
-from .tiles import WallTile, FloorTile, TrapTile
+from .tile_grid import TileGrid
+from .seeding import level_rngs, new_world_seed, GENERATOR_VERSION, GENERATION_SETTINGS
+
+class BatchSettings:
+    """Fixed generation settings with the SettingsManager.get_setting interface."""
+    def __init__(self, settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+class GenerationContext:
+    """
+    The parts of GameState a level generator reads, for generating maps
+    outside a running game (worker processes, batch tools).
+    """
+    def __init__(self, settings_manager, world_seed, dungeon_level):
+        self.settings_manager = settings_manager
+        self.world_seed = world_seed
+        self.dungeon_level = dungeon_level
+        self.player = None
+        self.generation_profiler = None
 
 class MapGenerator:
     _level_generators = {
@@ -8,18 +28,63 @@ class MapGenerator:
     }
 
     @staticmethod
-    def generate_map(width, height, map_type, entry_direction=None, game_state=None):
-        grid = [[WallTile() for _ in range(width)] for _ in range(height)]
+    def generate_map(width, height, map_type, entry_direction=None, game_state=None, world_seed=None, dungeon_level=None, phase_times=None, profiler=None, generation=None):
+        """
+        Builds a map from the (world_seed, dungeon_level) pair. Both default to
+        the values on game_state, so the same pair always yields the same grid.
+        If phase_times is a dict, it is filled with the per-phase timings.
+        If generation is a dict, it is filled with the generation_key of the
+        map built, settings included, for regenerate.
+        profiler defaults to game_state.generation_profiler and receives the
+        start and end of every generation phase.
+        """
+        if world_seed is None:
+            world_seed = getattr(game_state, 'world_seed', None)
+            if world_seed is None:
+                world_seed = new_world_seed()
+        if dungeon_level is None:
+            dungeon_level = getattr(game_state, 'dungeon_level', 1)
+        rng, np_rng = level_rngs(world_seed, dungeon_level)
+        # Read once, so the settings recorded in generation are the ones the level was built with.
+        settings_manager = getattr(game_state, 'settings_manager', None)
+        settings = {key: settings_manager.get_setting(key, default) if settings_manager else default
+                    for key, default in GENERATION_SETTINGS.items()}
+        if profiler is None:
+            profiler = getattr(game_state, 'generation_profiler', None)
+
+        grid = TileGrid(width, height)
         room_centers = []
         next_map_tile_pos = None
         player_spawn_pos = None
 
-        level_class = MapGenerator._level_generators.get(map_type)
-        if level_class:
-            level = level_class(width, height)
-            grid, room_centers, next_map_tile_pos, player_spawn_pos, room_coords, corridor_coords = level.generate_map(grid, room_centers, next_map_tile_pos, game_state)
-        else:
-            dungeon_level = DungeonLevel(width, height)
-            grid, room_centers, next_map_tile_pos, player_spawn_pos, room_coords, corridor_coords = dungeon_level.generate_map(grid, room_centers, next_map_tile_pos, game_state)
+        level_class = MapGenerator._level_generators.get(map_type, DungeonLevel)
+        level = level_class(width, height, rng, np_rng)
+        if profiler is not None:
+            profiler.context = {"map_type": map_type, "width": width, "height": height, "world_seed": world_seed, "dungeon_level": dungeon_level}
+            level.profiler = profiler
+        grid, room_centers, next_map_tile_pos, player_spawn_pos, room_mask, corridor_mask = level.generate_map(grid, room_centers, next_map_tile_pos, game_state, settings)
+        if generation is not None:
+            generation.update(MapGenerator.generation_key(width, height, map_type, world_seed, dungeon_level, settings))
+        if phase_times is not None:
+            phase_times.update(getattr(level, 'phase_times', {}))
 
-        return grid, room_centers, next_map_tile_pos, player_spawn_pos, room_coords, corridor_coords
+        return grid, room_centers, next_map_tile_pos, player_spawn_pos, room_mask, corridor_mask
+
+    @staticmethod
+    def generation_key(width, height, map_type, world_seed, dungeon_level, settings):
+        """Everything generate_map needs to rebuild a map, as a JSON-ready dict."""
+        return {
+            "world_seed": world_seed,
+            "dungeon_level": dungeon_level,
+            "generator_version": GENERATOR_VERSION,
+            "width": width,
+            "height": height,
+            "map_type": map_type,
+            "settings": dict(settings),
+        }
+
+    @staticmethod
+    def regenerate(generation):
+        """generate_map for a generation_key, independent of the running game's settings."""
+        context = GenerationContext(BatchSettings(generation["settings"]), generation["world_seed"], generation["dungeon_level"])
+        return MapGenerator.generate_map(generation["width"], generation["height"], generation["map_type"], game_state=context)
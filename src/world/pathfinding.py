@@ -0,0 +1,89 @@
+import heapq
+import math
+import numpy as np
+
+class AStarRouter:
+    """
+    4-directional A* over a fixed-size grid.
+    Score, parent and closed-set buffers are flat NumPy arrays allocated once
+    and reused by every search; only the cells a search touched are reset.
+    The cost of entering a cell is 1 plus its value in noise_field, which
+    replaces the per-step random jitter so routes are reproducible under a seed.
+    """
+    def __init__(self, width, height, noise_field):
+        self.width = width
+        self.height = height
+        size = width * height
+
+        valid = np.zeros((height, width), dtype=bool)
+        valid[1:-1, 1:-1] = True
+        self.valid = valid.ravel()
+        self.step_cost = 1.0 + np.asarray(noise_field, dtype=np.float64).ravel()
+        self.g_score = np.full(size, np.inf, dtype=np.float64)
+        self.parent = np.full(size, -1, dtype=np.int64)
+        self.closed = np.zeros(size, dtype=bool)
+        self._touched = []
+
+        # Element access through memoryviews is several times faster than
+        # indexing the arrays directly from Python.
+        self._valid_view = memoryview(self.valid)
+        self._cost_view = memoryview(self.step_cost)
+        self._g_view = memoryview(self.g_score)
+        self._parent_view = memoryview(self.parent)
+        self._closed_view = memoryview(self.closed)
+
+    def _reset(self):
+        if self._touched:
+            touched = np.array(self._touched, dtype=np.int64)
+            self.g_score[touched] = np.inf
+            self.parent[touched] = -1
+            self.closed[touched] = False
+            self._touched = []
+
+    def find_path(self, start, end):
+        self._reset()
+        width = self.width
+        valid, step_cost = self._valid_view, self._cost_view
+        g_score, parent, closed = self._g_view, self._parent_view, self._closed_view
+        touched = self._touched
+        end_x, end_y = end
+        start_index = start[1] * width + start[0]
+        end_index = end_y * width + end_x
+        offsets = (width, -width, 1, -1)
+
+        g_score[start_index] = 0.0
+        touched.append(start_index)
+        open_set = [(math.hypot(start[0] - end_x, start[1] - end_y), start_index)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue
+            if current == end_index:
+                return self._reconstruct(current, start_index)
+            closed[current] = True
+
+            current_g = g_score[current]
+            for offset in offsets:
+                neighbor = current + offset
+                if not valid[neighbor] or closed[neighbor]:
+                    continue
+                tentative_g_score = current_g + step_cost[neighbor]
+                if tentative_g_score < g_score[neighbor]:
+                    if g_score[neighbor] == math.inf:
+                        touched.append(neighbor)
+                    g_score[neighbor] = tentative_g_score
+                    parent[neighbor] = current
+                    y, x = divmod(neighbor, width)
+                    heapq.heappush(open_set, (tentative_g_score + math.hypot(x - end_x, y - end_y), neighbor))
+        return None
+
+    def _reconstruct(self, current, start_index):
+        width = self.width
+        parent = self._parent_view
+        path = []
+        while current != start_index:
+            y, x = divmod(current, width)
+            path.append((x, y))
+            current = parent[current]
+        return path[::-1]
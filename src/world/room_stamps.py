@@ -0,0 +1,36 @@
+from functools import lru_cache
+import numpy as np
+
+# Room shapes rasterized once per size as boolean stamps. A stamp's (0, 0)
+# cell is the top-left corner of the shape's bounding box; carving a room is
+# one masked assignment of the stamp into the terrain array. Stamps are
+# shared between calls, so they are returned read-only.
+
+def _frozen(stamp):
+    stamp.flags.writeable = False
+    return stamp
+
+@lru_cache(maxsize=None)
+def rectangle_stamp(width, height):
+    return _frozen(np.ones((height, width), dtype=bool))
+
+@lru_cache(maxsize=None)
+def circle_stamp(radius):
+    """Cells within radius of the centre, in a (2r + 1)-square box."""
+    offsets = np.arange(-radius, radius + 1)
+    return _frozen(offsets[np.newaxis, :] ** 2 + offsets[:, np.newaxis] ** 2 <= radius ** 2)
+
+@lru_cache(maxsize=None)
+def ellipse_stamp(rx, ry):
+    """Cells inside the axis-aligned ellipse with semi-axes rx and ry, in a (2rx + 1) x (2ry + 1) box."""
+    dx = np.arange(-rx, rx + 1) / rx
+    dy = np.arange(-ry, ry + 1) / ry
+    return _frozen(dx[np.newaxis, :] ** 2 + dy[:, np.newaxis] ** 2 <= 1)
+
+@lru_cache(maxsize=None)
+def l_shape_stamp(w1, h1, w2, h2):
+    """A w1 x h1 rectangle above a w2 x h2 one, both flush with the left edge."""
+    stamp = np.zeros((h1 + h2, max(w1, w2)), dtype=bool)
+    stamp[:h1, :w1] = True
+    stamp[h1:, :w2] = True
+    return _frozen(stamp)
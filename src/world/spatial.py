@@ -0,0 +1,168 @@
+import math
+import numpy as np
+
+_NO_POINT = np.iinfo(np.int64).max
+# The axis direction (+x, +y, -x, -y) each 45-degree sector extends along.
+_SECTOR_AXIS = np.array([0, 1, 1, 2, 2, 3, 3, 0])
+# Bucket radius of the vectorized all-points pass.
+_BATCH_RADIUS = 3
+
+class PointIndex:
+    """
+    Uniform grid-bucket index over a fixed set of integer points.
+    Points are sorted by bucket, so the points in a square block of buckets
+    are one slice per bucket row. Queries grow a square around the query
+    point and compute distances for everything inside it in one NumPy pass.
+    Distances are exact squared integers and ties break on the lower point
+    index, so results match a brute-force scan sorted by (distance, index).
+    """
+    def __init__(self, points, cell_size=None):
+        self.points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        count = len(self.points)
+        lo = self.points.min(axis=0) if count else np.zeros(2, dtype=np.int64)
+        hi = self.points.max(axis=0) if count else np.zeros(2, dtype=np.int64)
+        if cell_size is None:
+            # Roughly one point per bucket.
+            area = int(np.prod(hi - lo + 1))
+            cell_size = max(1, math.isqrt(max(1, area // max(count, 1))))
+        self.cell_size = cell_size
+        self.lo, self.hi = lo, hi
+        self.cells = (self.points - lo) // cell_size
+        self.grid_width, self.grid_height = ((hi - lo) // cell_size + 1).tolist()
+
+        bucket = self.cells[:, 1] * self.grid_width + self.cells[:, 0]
+        self.order = np.argsort(bucket, kind='stable')
+        self.bucket_start = np.zeros(self.grid_width * self.grid_height + 1, dtype=np.int64)
+        np.cumsum(np.bincount(bucket, minlength=self.grid_width * self.grid_height), out=self.bucket_start[1:])
+
+    def _square(self, cx, cy, r):
+        # Indices of the points in buckets within Chebyshev distance r of (cx, cy).
+        x0, x1 = max(cx - r, 0), min(cx + r, self.grid_width - 1)
+        y0, y1 = max(cy - r, 0), min(cy + r, self.grid_height - 1)
+        start, width = self.bucket_start, self.grid_width
+        rows = [self.order[start[y * width + x0]:start[y * width + x1 + 1]] for y in range(y0, y1 + 1)]
+        return np.concatenate(rows)
+
+    def _covering_radius(self, cx, cy):
+        return max(cx, self.grid_width - 1 - cx, cy, self.grid_height - 1 - cy)
+
+    def _unscanned_bound(self, r):
+        # Points outside the square differ by more than r * cell_size on some axis.
+        return (r * self.cell_size + 1) ** 2
+
+    def _sectors_settled(self, points, best, r):
+        # A sector's search is over once its best point beats anything outside
+        # the scanned square, or the point set ends before the square does in
+        # the direction the sector extends along.
+        count = len(self.points)
+        bound = self._unscanned_bound(r)
+        room = np.stack([self.hi[0] - points[:, 0], self.hi[1] - points[:, 1],
+                         points[:, 0] - self.lo[0], points[:, 1] - self.lo[1]], axis=1)
+        exhausted = room[:, _SECTOR_AXIS] < r * self.cell_size + 1
+        return (best // count < bound) | exhausted
+
+    def _candidates(self, i, r):
+        cx, cy = self.cells[i].tolist()
+        candidates = self._square(cx, cy, r)
+        candidates = candidates[candidates != i]
+        delta = self.points[candidates] - self.points[i]
+        return candidates, delta, (delta * delta).sum(axis=1)
+
+    def k_nearest(self, i, k):
+        """Returns the indices of the k points closest to point i, nearest first."""
+        k = min(k, len(self.points) - 1)
+        if k <= 0:
+            return []
+        cover = self._covering_radius(*self.cells[i].tolist())
+        r = 1
+        while True:
+            r = min(r, cover)
+            candidates, _, dist_sq = self._candidates(i, r)
+            if r >= cover or (len(candidates) >= k and np.partition(dist_sq, k - 1)[k - 1] < self._unscanned_bound(r)):
+                break
+            r *= 2
+        order = np.lexsort((candidates, dist_sq))[:k]
+        return candidates[order].tolist()
+
+    def _octant_nearest(self, sources, r):
+        # Best (dist_sq * n + j) key per 45-degree sector for each source point,
+        # looking only at the buckets within r of it, plus the coincident pairs
+        # seen, which have no direction.
+        count = len(self.points)
+        bucket_count = np.diff(self.bucket_start)
+        best = np.full((len(sources), 8), _NO_POINT, dtype=np.int64)
+        coincident = []
+        rows = np.arange(len(sources))
+        source_cells = self.cells[sources]
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                cx, cy = source_cells[:, 0] + dx, source_cells[:, 1] + dy
+                inside = (cx >= 0) & (cx < self.grid_width) & (cy >= 0) & (cy < self.grid_height)
+                bucket = np.where(inside, cy * self.grid_width + cx, 0)
+                occupancy = np.where(inside, bucket_count[bucket], 0)
+                for slot in range(int(occupancy.max(initial=0))):
+                    row = rows[occupancy > slot]
+                    source = sources[row]
+                    target = self.order[self.bucket_start[bucket[row]] + slot]
+                    delta = self.points[target] - self.points[source]
+                    dist_sq = (delta * delta).sum(axis=1)
+                    same = dist_sq == 0
+                    coincident.extend(zip(source[same].tolist(), target[same].tolist()))
+                    apart = ~same
+                    delta = delta[apart]
+                    sector = np.floor(np.arctan2(delta[:, 1], delta[:, 0]) / (math.pi / 4)).astype(np.int64) % 8
+                    np.minimum.at(best, (row[apart], sector), dist_sq[apart] * count + target[apart])
+        return best, coincident
+
+    def _octant_nearest_single(self, i):
+        # The same search for one point, growing its square until every sector
+        # is settled; used for the few points the batch pass leaves open.
+        count = len(self.points)
+        cover = self._covering_radius(*self.cells[i].tolist())
+        r = 2 * _BATCH_RADIUS
+        while True:
+            r = min(r, cover)
+            candidates, delta, dist_sq = self._candidates(i, r)
+            apart = dist_sq > 0
+            sector = np.floor(np.arctan2(delta[apart, 1], delta[apart, 0]) / (math.pi / 4)).astype(np.int64) % 8
+            best = np.full(8, _NO_POINT, dtype=np.int64)
+            np.minimum.at(best, sector, dist_sq[apart] * count + candidates[apart])
+            if r >= cover or self._sectors_settled(self.points[i:i + 1], best[np.newaxis], r).all():
+                return best
+            r *= 2
+
+    def all_pair_edges(self):
+        """Returns sorted (dist_sq, i, j) edges, i < j, for every pair of points."""
+        points = self.points.tolist()
+        edges = []
+        for i, (xi, yi) in enumerate(points):
+            for j in range(i + 1, len(points)):
+                dx, dy = xi - points[j][0], yi - points[j][1]
+                edges.append((dx * dx + dy * dy, i, j))
+        edges.sort()
+        return edges
+
+    def octant_neighbor_edges(self):
+        """
+        Returns sorted (dist_sq, i, j) edges, i < j, linking every point to its
+        nearest neighbour in each of eight 45-degree sectors, plus every pair
+        of coincident points. With sectors narrower than 60 degrees this graph
+        contains the Euclidean minimum spanning tree, so Kruskal over these
+        O(n) edges picks the same tree as over the complete graph.
+        """
+        count = len(self.points)
+        edges = set()
+        # One vectorized pass settles most points from their own neighbourhood;
+        # the rest, mostly near the edge of the point set, search further alone.
+        best, coincident = self._octant_nearest(np.arange(count), _BATCH_RADIUS)
+        settled = self._sectors_settled(self.points, best, _BATCH_RADIUS).all(axis=1)
+        for i in np.nonzero(~settled)[0].tolist():
+            best[i] = self._octant_nearest_single(i)
+        for i, j in coincident:
+            if i != j:
+                edges.add((0, min(i, j), max(i, j)))
+        rows, sectors = np.nonzero(best != _NO_POINT)
+        for i, key in zip(rows.tolist(), best[rows, sectors].tolist()):
+            j = key % count
+            edges.add((key // count, min(i, j), max(i, j)))
+        return sorted(edges)
@@ -0,0 +1,26 @@
+import numpy as np
+
+# Integer terrain codes used by the level generators. Keeping the generator
+# working on a small integer array (instead of 1-char strings) lets the
+# smoothing/water passes run as whole-array NumPy operations.
+WALL = 0
+GRASS = 1
+MUD = 2
+ROCK = 3
+RUBBLE = 4
+WATER = 5
+
+# Walkable ground terrain, in the order the generator has always drawn from.
+TERRAIN_CODES = [GRASS, MUD, ROCK, RUBBLE]
+
+CHAR_TO_CODE = {'#': WALL, 'g': GRASS, 'm': MUD, 'o': ROCK, '%': RUBBLE, '~': WATER}
+CODE_TO_CHAR = np.array(['#', 'g', 'm', 'o', '%', '~'])
+
+def chars_to_codes(char_array):
+    codes = np.full(char_array.shape, WALL, dtype=np.uint8)
+    for char, code in CHAR_TO_CODE.items():
+        codes[char_array == char] = code
+    return codes
+
+def codes_to_chars(codes):
+    return CODE_TO_CHAR[codes]
@@ -0,0 +1,131 @@
+import numpy as np
+from .tiles import TILE_TYPES, WallTile, TrapTile, FLAG_WALKABLE, FLAG_TRANSPARENT, FLAG_TRAP, FLAG_EXPLORED, FLAG_TRAP_REVEALED, WALL_UP, WALL_DOWN, WALL_LEFT, WALL_RIGHT
+
+def _static_flags(tile_type):
+    flags = 0
+    if tile_type.is_walkable:
+        flags |= FLAG_WALKABLE
+    if tile_type.is_transparent:
+        flags |= FLAG_TRANSPARENT
+    if tile_type is TrapTile.tile_type:
+        flags |= FLAG_TRAP
+    return flags
+
+# Static flags indexed by type id, so a whole type-id array converts in one lookup.
+TYPE_FLAGS = np.array([_static_flags(tile_type) for tile_type in TILE_TYPES], dtype=np.uint8)
+TYPE_CHARACTERS = [tile_type.character for tile_type in TILE_TYPES]
+
+def compute_wall_codes(type_ids):
+    """
+    The 4-bit neighbour code of every wall cell (WALL_UP | WALL_DOWN | ...
+    for each adjacent wall), 0 elsewhere. Cells beyond the array count as open.
+    """
+    wall = type_ids == WallTile.tile_type.type_id
+    codes = np.zeros(type_ids.shape, dtype=np.uint8)
+    codes[1:, :] |= wall[:-1, :] * np.uint8(WALL_UP)
+    codes[:-1, :] |= wall[1:, :] * np.uint8(WALL_DOWN)
+    codes[:, 1:] |= wall[:, :-1] * np.uint8(WALL_LEFT)
+    codes[:, :-1] |= wall[:, 1:] * np.uint8(WALL_RIGHT)
+    codes[~wall] = 0
+    return codes
+
+def _type_id(tile_type):
+    # Accepts a type id, a TileType or a Tile class/instance.
+    return getattr(getattr(tile_type, 'tile_type', tile_type), 'type_id', tile_type)
+
+class TileGrid:
+    """
+    Numeric storage for a map: a uint8 type id and a uint8 flag byte per cell.
+    Bulk queries return boolean masks that other systems can use directly.
+    """
+    def __init__(self, width, height, type_ids=None, wall_codes=None):
+        self.width = width
+        self.height = height
+        if type_ids is None:
+            type_ids = np.full((height, width), WallTile.tile_type.type_id, dtype=np.uint8)
+        self.type_ids = np.array(type_ids, dtype=np.uint8)
+        self.flags = TYPE_FLAGS[self.type_ids]
+        # Wall glyph layer: depends only on the terrain, so it is kept up to date
+        # on type changes instead of being worked out per frame. A saved copy can be passed in.
+        self.wall_codes = np.array(wall_codes, dtype=np.uint8) if wall_codes is not None else compute_wall_codes(self.type_ids)
+        # Bumped on every type change, so views derived from the terrain can tell they are stale.
+        self.version = 0
+
+    @property
+    def nbytes(self):
+        return self.type_ids.nbytes + self.flags.nbytes + self.wall_codes.nbytes
+
+    def set_types(self, type_ids):
+        self.type_ids[:] = type_ids
+        self.flags = TYPE_FLAGS[self.type_ids]
+        self.wall_codes = compute_wall_codes(self.type_ids)
+        self.version += 1
+
+    def set_type(self, x, y, tile_type):
+        type_id = _type_id(tile_type)
+        self.type_ids[y, x] = type_id
+        # Keep per-cell exploration, but trap state belongs to the old tile.
+        self.flags[y, x] = TYPE_FLAGS[type_id] | (self.flags[y, x] & FLAG_EXPLORED)
+        self._update_wall_codes(x, y)
+        self.version += 1
+
+    def _update_wall_codes(self, x, y):
+        # Only the cell and its four neighbours can change; recompute the 3x3
+        # around it from a 5x5 window so each of those sees all its neighbours.
+        x0, y0 = max(x - 2, 0), max(y - 2, 0)
+        codes = compute_wall_codes(self.type_ids[y0:y + 3, x0:x + 3])
+        top, left = max(y - 1, 0), max(x - 1, 0)
+        self.wall_codes[top:y + 2, left:x + 2] = codes[top - y0:y + 2 - y0, left - x0:x + 2 - x0]
+
+    def wall_code_at(self, x, y):
+        return self.wall_codes[y, x]
+
+    def get_flag(self, x, y, flag):
+        return bool(self.flags[y, x] & flag)
+
+    def set_flag(self, x, y, flag, value=True):
+        if value:
+            self.flags[y, x] |= flag
+        else:
+            self.flags[y, x] &= ~flag & 0xFF
+
+    def character_at(self, x, y):
+        if self.flags[y, x] & FLAG_TRAP_REVEALED:
+            return TrapTile.revealed_character
+        return TYPE_CHARACTERS[self.type_ids[y, x]]
+
+    def mask(self, flag):
+        return (self.flags & flag) != 0
+
+    def walkable_mask(self):
+        return self.mask(FLAG_WALKABLE)
+
+    def transparent_mask(self):
+        return self.mask(FLAG_TRANSPARENT)
+
+    def explored_mask(self):
+        return self.mask(FLAG_EXPLORED)
+
+    def trap_mask(self):
+        return self.mask(FLAG_TRAP)
+
+    def cells_of_type(self, *tile_types):
+        return np.isin(self.type_ids, [_type_id(tile_type) for tile_type in tile_types])
+
+    def set_flag_mask(self, flag, mask):
+        self.flags[mask] |= flag
+
+    def merge_flag_window(self, flag, mask, x0, y0):
+        """
+        ORs flag into the cells set in mask, whose top-left cell is (x0, y0),
+        and returns the part of mask that did not have the flag yet.
+        """
+        window = self.flags[y0:y0 + mask.shape[0], x0:x0 + mask.shape[1]]
+        added = mask & ((window & flag) == 0)
+        window |= mask.view(np.uint8) * np.uint8(flag)
+        return added
+
+    @staticmethod
+    def positions(mask):
+        """Returns the (x, y) positions of the set cells in row-major order."""
+        return [(x, y) for y, x in np.argwhere(mask).tolist()]
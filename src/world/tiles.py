@@ -1,13 +1,82 @@
 import curses
 from ..ui.themes import COLOR_PAIR_CORRIDOR, COLOR_PAIR_EXPLORED, COLOR_PAIR_FLOOR, COLOR_PAIR_GRASS, COLOR_PAIR_MUD, COLOR_PAIR_NEXT_MAP_TILE, COLOR_PAIR_ROCK, COLOR_PAIR_RUBBLE, COLOR_PAIR_UNEXPLORED, COLOR_PAIR_WALL
+from .terrain import WALL, GRASS, MUD, ROCK, RUBBLE, WATER
+
+# Type ids for tiles that are not produced by the terrain generator.
+FLOOR = 6
+NEXT_MAP = 7
+TRAP = 8
+
+# Per-cell flag bits stored by TileGrid. Walkable/transparent/trap follow
+# from the tile type; the rest is per-cell state.
+FLAG_WALKABLE = 0x01
+FLAG_TRANSPARENT = 0x02
+FLAG_TRAP = 0x04
+FLAG_EXPLORED = 0x08
+FLAG_TRAP_TRIGGERED = 0x10
+FLAG_TRAP_REVEALED = 0x20
+
+class TileType:
+    """
+    Immutable description of one kind of tile. There is exactly one instance
+    per tile type (a flyweight); per-cell state lives in arrays owned by Map.
+    """
+    __slots__ = ('type_id', 'name', 'character', 'is_walkable', 'is_transparent', 'description')
+
+    def __init__(self, type_id, name, character, is_walkable, is_transparent, description):
+        object.__setattr__(self, 'type_id', type_id)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'character', character)
+        object.__setattr__(self, 'is_walkable', is_walkable)
+        object.__setattr__(self, 'is_transparent', is_transparent)
+        object.__setattr__(self, 'description', description)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TileType '{self.name}' is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TileType '{self.name}' is immutable")
+
+    def __repr__(self):
+        return f"TileType({self.type_id}, {self.name!r})"
 
 class Tile:
-    def __init__(self, character, is_walkable, is_transparent, description="an ordinary tile"):
-        self.character = character
-        self.is_walkable = is_walkable
-        self.is_transparent = is_transparent
-        self.is_explored = False
-        self.description = description
+    """
+    Thin view of a single map cell. Static properties come from the shared
+    TileType; per-cell state is read from and written to the owning map.
+    Views are cheap to create and are not stored in the map.
+    """
+    __slots__ = ('game_map', 'x', 'y')
+    tile_type = None
+
+    def __init__(self, game_map=None, x=None, y=None):
+        self.game_map = game_map
+        self.x = x
+        self.y = y
+
+    @property
+    def character(self):
+        return self.tile_type.character
+
+    @property
+    def is_walkable(self):
+        return self.tile_type.is_walkable
+
+    @property
+    def is_transparent(self):
+        return self.tile_type.is_transparent
+
+    @property
+    def description(self):
+        return self.tile_type.description
+
+    @property
+    def is_explored(self):
+        return self.game_map is not None and self.game_map.tiles.get_flag(self.x, self.y, FLAG_EXPLORED)
+
+    @is_explored.setter
+    def is_explored(self, value):
+        self.game_map.tiles.set_flag(self.x, self.y, FLAG_EXPLORED, value)
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         # This method will be overridden by subclasses
@@ -23,8 +92,8 @@ class Tile:
         }
 
 class FloorTile(Tile):
-    def __init__(self):
-        super().__init__('.', True, True, "a stone floor")
+    __slots__ = ()
+    tile_type = TileType(FLOOR, "FloorTile", '.', True, True, "a stone floor")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -71,34 +140,18 @@ class WallTile(Tile):
         (True, True, True, True): '┼', # All
     }
 
-    def __init__(self):
-        super().__init__('#', False, False, "a solid wall")
-
-    def _get_wall_character(self, game_map, map_x, map_y):
-        # Check neighbors
-        up = (map_y > 0 and isinstance(game_map.grid[map_y - 1][map_x], WallTile))
-        down = (map_y < game_map.height - 1 and isinstance(game_map.grid[map_y + 1][map_x], WallTile))
-        left = (map_x > 0 and isinstance(game_map.grid[map_y][map_x - 1], WallTile))
-        right = (map_x < game_map.width - 1 and isinstance(game_map.grid[map_y][map_x + 1], WallTile))
-
-        # Return the appropriate character based on neighbors
-        return self._BOX_CHARS.get((up, down, left, right), '#') # Default to '#' if not found
+    __slots__ = ()
+    tile_type = TileType(WALL, "WallTile", '#', False, False, "a solid wall")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
         color_pair = curses.color_pair(COLOR_PAIR_WALL)
-        if is_visible:
-            # If visible, determine the correct box-drawing character
-            if game_state and game_state.game_map and map_x is not None and map_y is not None:
-                char = self._get_wall_character(game_state.game_map, map_x, map_y)
-            else:
-                char = self.character # Fallback to default if game_map or map_coords not available
-        elif self.is_explored:
-            color_pair = curses.color_pair(COLOR_PAIR_EXPLORED)
-            if game_state and game_state.game_map and map_x is not None and map_y is not None:
-                char = self._get_wall_character(game_state.game_map, map_x, map_y)
-            else:
-                char = self.character # Fallback
+        if is_visible or self.is_explored:
+            if not is_visible:
+                color_pair = curses.color_pair(COLOR_PAIR_EXPLORED)
+            # The box-drawing character comes from the map's precomputed wall glyph layer.
+            if self.game_map is not None:
+                char = WALL_GLYPHS[self.game_map.tiles.wall_code_at(self.x, self.y)]
         else:
             char = ' '
             color_pair = curses.color_pair(COLOR_PAIR_UNEXPLORED)
@@ -109,8 +162,8 @@ class WallTile(Tile):
             pass
 
 class NextMapTile(Tile):
-    def __init__(self):
-        super().__init__('X', True, True, "an exit to the next area")
+    __slots__ = ()
+    tile_type = TileType(NEXT_MAP, "NextMapTile", 'X', True, True, "an exit to the next area")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -132,8 +185,8 @@ class NextMapTile(Tile):
             pass
 
 class GrassTile(Tile):
-    def __init__(self):
-        super().__init__('.', True, True, "a patch of grass")
+    __slots__ = ()
+    tile_type = TileType(GRASS, "GrassTile", '.', True, True, "a patch of grass")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -155,8 +208,8 @@ class GrassTile(Tile):
             pass
 
 class MudTile(Tile):
-    def __init__(self):
-        super().__init__('.', True, True, "a patch of mud")
+    __slots__ = ()
+    tile_type = TileType(MUD, "MudTile", '.', True, True, "a patch of mud")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -178,8 +231,8 @@ class MudTile(Tile):
             pass
 
 class RockTile(Tile):
-    def __init__(self):
-        super().__init__('.', True, True, "a rocky area")
+    __slots__ = ()
+    tile_type = TileType(ROCK, "RockTile", '.', True, True, "a rocky area")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -201,8 +254,8 @@ class RockTile(Tile):
             pass
 
 class RubbleTile(Tile):
-    def __init__(self):
-        super().__init__('.', True, True, "a pile of rubble")
+    __slots__ = ()
+    tile_type = TileType(RUBBLE, "RubbleTile", '.', True, True, "a pile of rubble")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -224,13 +277,34 @@ class RubbleTile(Tile):
             pass
 
 class TrapTile(Tile):
-    def __init__(self, character='.', is_walkable=True, is_triggered=False, is_revealed=False):
-        super().__init__(character, is_walkable, True, "a suspicious-looking floor tile")
-        self.is_triggered = is_triggered
-        self.is_revealed = is_revealed
-        if self.is_revealed:
-            self.character = '+'
-            self.description = "a triggered trap"
+    __slots__ = ()
+    tile_type = TileType(TRAP, "TrapTile", '.', True, True, "a suspicious-looking floor tile")
+    revealed_character = '+'
+    revealed_description = "a triggered trap"
+
+    @property
+    def character(self):
+        return self.revealed_character if self.is_revealed else self.tile_type.character
+
+    @property
+    def description(self):
+        return self.revealed_description if self.is_revealed else self.tile_type.description
+
+    @property
+    def is_triggered(self):
+        return self.game_map is not None and self.game_map.tiles.get_flag(self.x, self.y, FLAG_TRAP_TRIGGERED)
+
+    @is_triggered.setter
+    def is_triggered(self, value):
+        self.game_map.tiles.set_flag(self.x, self.y, FLAG_TRAP_TRIGGERED, value)
+
+    @property
+    def is_revealed(self):
+        return self.game_map is not None and self.game_map.tiles.get_flag(self.x, self.y, FLAG_TRAP_REVEALED)
+
+    @is_revealed.setter
+    def is_revealed(self, value):
+        self.game_map.tiles.set_flag(self.x, self.y, FLAG_TRAP_REVEALED, value)
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -258,6 +332,8 @@ class TrapTile(Tile):
             player.take_damage(2)
             if game_state and game_state.logger:
                 game_state.logger.add_message("A trap was triggered! You lost 2 HP.")
+            if game_state and game_state.event_manager:
+                game_state.event_manager.publish("trap_triggered", self.x, self.y)
             self.reveal()
             return True
         return False
@@ -265,7 +341,6 @@ class TrapTile(Tile):
     def reveal(self):
         if not self.is_revealed:
             self.is_revealed = True
-        self.character = '+'
 
     def to_dict(self):
         data = super().to_dict()
@@ -273,21 +348,9 @@ class TrapTile(Tile):
         data["is_revealed"] = self.is_revealed
         return data
 
-    @classmethod
-    def from_dict(cls, data):
-        return cls(
-            character=data.get("character", '.'),
-            is_walkable=data.get("is_walkable", True),
-            is_triggered=data.get("is_triggered", False),
-            is_revealed=data.get("is_revealed", False)
-        )
-
-
-import time
-
 class WaterTile(Tile):
-    def __init__(self):
-        super().__init__('~', True, True, "deep water")
+    __slots__ = ()
+    tile_type = TileType(WATER, "WaterTile", '~', True, True, "deep water")
 
     def render(self, stdscr, y, x, is_visible, is_player_on, game_state=None, map_x=None, map_y=None):
         char = self.character
@@ -308,17 +371,18 @@ class WaterTile(Tile):
         except curses.error:
             pass
 
-
-    def to_dict(self):
-        return {
-            "type": self.__class__.__name__,
-            "character": self.character,
-            "is_walkable": self.is_walkable,
-            "is_transparent": self.is_transparent,
-            "is_explored": self.is_explored
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        return cls()
-
+# Box-drawing characters indexed by a wall's neighbour code: a bit each for a
+# wall above, below, left and right of it (see TileGrid.wall_codes).
+WALL_UP, WALL_DOWN, WALL_LEFT, WALL_RIGHT = 1, 2, 4, 8
+WALL_GLYPHS = [
+    WallTile._BOX_CHARS.get((bool(code & WALL_UP), bool(code & WALL_DOWN), bool(code & WALL_LEFT), bool(code & WALL_RIGHT)), '#')
+    for code in range(16)
+]
+
+# Tile view classes indexed by type id. Map stores only the ids.
+TILE_CLASSES = sorted(
+    [WallTile, GrassTile, MudTile, RockTile, RubbleTile, WaterTile, FloorTile, NextMapTile, TrapTile],
+    key=lambda tile_class: tile_class.tile_type.type_id
+)
+TILE_TYPES = [tile_class.tile_type for tile_class in TILE_CLASSES]
+TILE_TYPES_BY_NAME = {tile_type.name: tile_type for tile_type in TILE_TYPES}
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world.levels.dungeon_level import DungeonLevel
+from src.world.seeding import level_rngs
+from src.world.terrain import TERRAIN_CODES, codes_to_chars, chars_to_codes
+
+def legacy_cellular_automata(map_array, iterations=6):
+    # The original per-cell loop from DungeonLevel, kept here as the reference.
+    terrain_chars = ['g', 'm', 'o', '%']
+    height, width = map_array.shape
+    for _ in range(iterations):
+        new_map = np.copy(map_array)
+        for y in range(1, height - 1):
+            for x in range(1, width - 1):
+                if map_array[y, x] in terrain_chars:
+                    neighbor_counts = {c: 0 for c in terrain_chars}
+                    for dy in [-1, 0, 1]:
+                        for dx in [-1, 0, 1]:
+                            if dx == 0 and dy == 0: continue
+                            if map_array[y + dy, x + dx] in terrain_chars:
+                                neighbor_counts[map_array[y + dy, x + dx]] += 1
+                    most_common = max(neighbor_counts, key=neighbor_counts.get)
+                    new_map[y, x] = most_common
+        map_array = new_map
+    return map_array
+
+def build_rooms(width, height, num_rooms, seed):
+    level = DungeonLevel(width, height, *level_rngs(seed, 1))
+    level.generate_rooms(num_rooms, 5, 10)
+    return level
+
+def run(width, height, num_rooms, seed=1234, iterations=6):
+    level = build_rooms(width, height, num_rooms, seed)
+    char_map = codes_to_chars(level.map_array)
+
+    start = time.perf_counter()
+    legacy = legacy_cellular_automata(char_map, iterations)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    level._apply_cellular_automata(iterations)
+    vectorized_time = time.perf_counter() - start
+
+    identical = np.array_equal(chars_to_codes(legacy), level.map_array)
+    print(f"{width}x{height} rooms={num_rooms}: legacy {legacy_time * 1000:.1f} ms, "
+          f"vectorized {vectorized_time * 1000:.2f} ms, "
+          f"speedup x{legacy_time / max(vectorized_time, 1e-9):.0f}, identical={identical}")
+    return identical
+
+if __name__ == "__main__":
+    results = [
+        run(80, 20, 20),
+        run(100, 30, 20),
+        run(200, 200, 80),
+    ]
+    if not all(results):
+        sys.exit("Vectorized cellular automata diverged from the legacy loop.")
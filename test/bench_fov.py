@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.systems.fov import fov_radii, shadowcast
+from src.world.batchgen import BatchSettings
+from src.world.map_generator import MapGenerator, GenerationContext
+
+RADIUS = 6
+
+def legacy_fov(transparent, player_x, player_y, x_radius, y_radius):
+    # The original per-cell Bresenham walks from compute_fov, kept here as the reference.
+    height, width = transparent.shape
+    visible = np.zeros((height, width), dtype=bool)
+    visible[player_y, player_x] = True
+    for x in range(max(player_x - x_radius, 0), min(player_x + x_radius + 1, width)):
+        for y in range(max(player_y - y_radius, 0), min(player_y + y_radius + 1, height)):
+            if ((x - player_x) / x_radius) ** 2 + ((y - player_y) / y_radius) ** 2 <= 1:
+                visible[y, x] |= legacy_line_of_sight(transparent, player_x, player_y, x, y)
+    return visible
+
+def legacy_line_of_sight(transparent, x1, y1, x2, y2):
+    start_x, start_y = x1, y1
+    dx, dy = abs(x2 - x1), abs(y2 - y1)
+    sx, sy = (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+    err = dx - dy
+    while True:
+        if x1 == x2 and y1 == y2:
+            return True
+        if (x1 != start_x or y1 != start_y) and not transparent[y1, x1]:
+            return False
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x1 += sx
+        if e2 < dx:
+            err += dx
+            y1 += sy
+
+def bench(seed, samples=300):
+    context = GenerationContext(BatchSettings({"num_rooms": 80}), seed, 1)
+    grid = MapGenerator.generate_map(200, 200, "dungeon", game_state=context, world_seed=seed, dungeon_level=1)[0]
+    transparent = grid.transparent_mask()
+    walkable = np.argwhere(grid.walkable_mask())
+    rng = np.random.default_rng(seed)
+    positions = walkable[rng.choice(len(walkable), size=samples)]
+
+    results = {}
+    for direction in ('s', 'd'):
+        x_radius, y_radius = fov_radii(RADIUS, direction)
+        new_time = legacy_time = 0.0
+        new_cells = legacy_cells = agree = 0
+        for y, x in positions.tolist():
+            start = time.perf_counter()
+            new = shadowcast(transparent, x, y, x_radius, y_radius)
+            new_time += time.perf_counter() - start
+            start = time.perf_counter()
+            legacy = legacy_fov(transparent, x, y, x_radius, y_radius)
+            legacy_time += time.perf_counter() - start
+            new_cells += new.sum()
+            legacy_cells += legacy.sum()
+            agree += (new & legacy).sum()
+        results[direction] = (new_time, legacy_time, new_cells, legacy_cells, agree)
+        print(f"seed {seed} direction {direction}: shadowcast {new_time / samples * 1e6:.0f} us/call, "
+              f"legacy {legacy_time / samples * 1e6:.0f} us/call, {new_cells / samples:.1f} vs {legacy_cells / samples:.1f} cells seen, "
+              f"{agree / max(legacy_cells, 1):.1%} of legacy cells also seen")
+    return results
+
+if __name__ == "__main__":
+    for seed in range(3):
+        bench(seed)
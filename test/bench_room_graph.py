@@ -0,0 +1,62 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world.spatial import PointIndex
+
+ROOM_COUNTS = [80, 300, 1000, 3000]
+LEGACY_MAX_ROOMS = 1000
+
+def kruskal(count, edges):
+    parent = list(range(count))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    tree = []
+    for _, i, j in edges:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_i] = root_j
+            tree.append((i, j))
+    return tree
+
+def legacy_edges(centers):
+    # The complete graph the original _connect_rooms_mst sorted.
+    edges = []
+    for i in range(len(centers)):
+        for j in range(i + 1, len(centers)):
+            dx, dy = centers[i][0] - centers[j][0], centers[i][1] - centers[j][1]
+            edges.append(((dx**2 + dy**2)**0.5, i, j))
+    edges.sort()
+    return edges
+
+def run(room_count, run_legacy, seed=0):
+    rng = random.Random(seed)
+    side = int((room_count * 120) ** 0.5)
+    centers = [(rng.randint(1, side), rng.randint(1, side)) for _ in range(room_count)]
+
+    start = time.perf_counter()
+    edges = PointIndex(centers).octant_neighbor_edges()
+    tree = kruskal(room_count, edges)
+    line = f"rooms={room_count}: indexed {(time.perf_counter() - start) * 1000:.1f} ms ({len(edges)} edges)"
+    identical = True
+    if run_legacy:
+        start = time.perf_counter()
+        legacy = legacy_edges(centers)
+        legacy_tree = kruskal(room_count, legacy)
+        identical = legacy_tree == tree
+        line += f" | complete graph {(time.perf_counter() - start) * 1000:.1f} ms ({len(legacy)} edges), identical={identical}"
+    print(line)
+    return identical
+
+if __name__ == "__main__":
+    identical = True
+    for room_count in ROOM_COUNTS:
+        identical = run(room_count, room_count <= LEGACY_MAX_ROOMS) and identical
+    if not identical:
+        sys.exit("Indexed MST diverged from the complete-graph MST.")
@@ -0,0 +1,126 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+from itertools import product
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world.levels.dungeon_level import DungeonLevel
+from src.world.room_stamps import rectangle_stamp, circle_stamp, ellipse_stamp, l_shape_stamp
+from src.world.seeding import level_rngs
+from src.world.terrain import TERRAIN_CODES
+
+SIZES = [(80, 24, 20), (200, 200, 80), (500, 500, 400), (1000, 1000, 1500)]
+
+def legacy_room_cells(level, shape, x, y, dims):
+    """
+    The cells the original per-cell loops carved for one room, in carving
+    order. (x, y) is the top-left corner of a rectangle or L shape and the
+    centre of a circle or ellipse.
+    """
+    if shape == 'rectangle':
+        w, h = dims
+        if x + w < level.width - 1 and y + h < level.height - 1:
+            for ry in range(y, y + h):
+                for rx in range(x, x + w):
+                    yield rx, ry
+    elif shape == 'circle':
+        (r,) = dims
+        for cy in range(y - r, y + r + 1):
+            for cx in range(x - r, x + r + 1):
+                if (cx - x) ** 2 + (cy - y) ** 2 <= r ** 2 and level._is_valid(cx, cy):
+                    yield cx, cy
+    elif shape == 'ellipse':
+        rx, ry = dims
+        for cy in range(y - ry, y + ry + 1):
+            for cx in range(x - rx, x + rx + 1):
+                if ((cx - x) / rx) ** 2 + ((cy - y) / ry) ** 2 <= 1 and level._is_valid(cx, cy):
+                    yield cx, cy
+    else:
+        w1, h1, w2, h2 = dims
+        for ry in range(y, y + h1 + h2):
+            for rx in range(x, x + (w1 if ry < y + h1 else w2)):
+                if level._is_valid(rx, ry):
+                    yield rx, ry
+
+def legacy_generate_rooms(level, num_rooms, min_size, max_size):
+    # The original per-cell room carving from DungeonLevel, kept here as the reference.
+    room_coords = set()
+    for _ in range(num_rooms):
+        shape = level.rng.choice(['rectangle', 'circle', 'ellipse', 'l_shape'])
+        if shape == 'rectangle':
+            dims = level.rng.randint(min_size, max_size), level.rng.randint(min_size, max_size)
+            x, y = level.rng.randint(1, level.width - dims[0] - 1), level.rng.randint(1, level.height - dims[1] - 1)
+        elif shape == 'circle':
+            dims = (level.rng.randint(min_size // 2, max_size // 2),)
+            x, y = level.rng.randint(1 + dims[0], level.width - dims[0] - 1), level.rng.randint(1 + dims[0], level.height - dims[0] - 1)
+        elif shape == 'ellipse':
+            dims = level.rng.randint(min_size // 2, max_size // 2), level.rng.randint(min_size // 2, max_size // 2)
+            x, y = level.rng.randint(1 + dims[0], level.width - dims[0] - 1), level.rng.randint(1 + dims[1], level.height - dims[1] - 1)
+        else:
+            dims = tuple(level.rng.randint(min_size, max_size) for _ in range(4))
+            w1, h1, w2, h2 = dims
+            x, y = level.rng.randint(1, level.width - max(w1, w2) - 1), level.rng.randint(1, level.height - h1 - h2 - 1)
+        for cell in legacy_room_cells(level, shape, x, y, dims):
+            level.map_array[cell[1], cell[0]] = level.rng.choice(TERRAIN_CODES)
+            room_coords.add(cell)
+    return room_coords
+
+def stamps_match_legacy(min_size=5, max_size=10):
+    """Rasterizes every stamp the generator can draw and the legacy loops at the same origin. Returns (shapes, identical)."""
+    sizes, radii = range(min_size, max_size + 1), range(min_size // 2, max_size // 2 + 1)
+    shapes = ([('rectangle', dims, rectangle_stamp(*dims)) for dims in product(sizes, repeat=2)]
+              + [('circle', (r,), circle_stamp(r)) for r in radii]
+              + [('ellipse', dims, ellipse_stamp(*dims)) for dims in product(radii, repeat=2)]
+              + [('l_shape', dims, l_shape_stamp(*dims)) for dims in product(sizes, repeat=4)])
+    side = 2 * max_size + 6
+    level = DungeonLevel(side, side, *level_rngs(0, 1))
+    origin = 2
+    for shape, dims, stamp in shapes:
+        height, width = stamp.shape
+        stamped = np.zeros((side, side), dtype=bool)
+        stamped[origin:origin + height, origin:origin + width] = stamp
+        # Circles and ellipses are placed by their centre.
+        x, y = (origin + width // 2, origin + height // 2) if shape in ('circle', 'ellipse') else (origin, origin)
+        legacy = np.zeros((side, side), dtype=bool)
+        for cx, cy in legacy_room_cells(level, shape, x, y, dims):
+            legacy[cy, cx] = True
+        if not np.array_equal(stamped, legacy):
+            return len(shapes), False
+    return len(shapes), True
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def bench(width, height, num_rooms, seed=0):
+    level = DungeonLevel(width, height, *level_rngs(seed, 1))
+    _, stamped_time, stamped_peak = measure(lambda: level.generate_rooms(num_rooms, 5, 10))
+    stamped_cells = int(level.room_mask.sum())
+
+    legacy_level = DungeonLevel(width, height, *level_rngs(seed, 1))
+    _, legacy_time, legacy_peak = measure(lambda: legacy_generate_rooms(legacy_level, num_rooms, 5, 10))
+
+    # The two runs draw their rooms from different random streams, so only the timings compare.
+    print(f"rooms {width}x{height} x{num_rooms}: stamps {stamped_time * 1000:.2f} ms, {stamped_cells} cells, "
+          f"layer {level.room_mask.nbytes / 1024:.0f} KiB, peak {stamped_peak / 1024:.0f} KiB"
+          f" | legacy {legacy_time * 1000:.1f} ms, peak {legacy_peak / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    random.seed(0)
+    np.random.seed(0)
+    shape_count, identical = stamps_match_legacy()
+    print(f"stamps vs legacy loops: {shape_count} shapes and sizes, identical={identical}")
+    for width, height, num_rooms in SIZES:
+        bench(width, height, num_rooms)
+    if not identical:
+        sys.exit("Room stamps diverged from the legacy per-cell loops.")
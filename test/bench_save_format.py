@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.systems.save_format import write_save, SaveReader
+from src.systems.simulation import new_headless_game, random_walk, run_headless
+from src.world.map import Map
+
+SIZES = [(100, 20), (200, 200), (500, 500)]
+
+def bench(width, height, directory, seed=0):
+    engine = new_headless_game(seed, random_walk(seed, 500), width, height, {"num_rooms": max(20, width * height // 2500)})
+    run_headless(engine)
+    game_state = engine.game_state
+
+    path = os.path.join(directory, "bench.json")
+    start = time.perf_counter()
+    with open(path, 'w') as f:
+        json.dump(game_state.to_dict(), f, indent=4)
+    json_save = time.perf_counter() - start
+    json_size = os.path.getsize(path)
+    start = time.perf_counter()
+    with open(path, 'r') as f:
+        Map.from_dict(json.load(f)["game_map"], None)
+    json_load = time.perf_counter() - start
+
+    line = f"{width}x{height}: json {json_size / 1024:.0f} KiB, save {json_save * 1000:.0f} ms, load {json_load * 1000:.0f} ms"
+    for codec, delta in (("none", False), ("zlib", False), ("zlib", True)):
+        game_state.settings_manager.settings["save_terrain_delta"] = delta
+        path = os.path.join(directory, f"bench_{codec}.sav")
+        start = time.perf_counter()
+        size = write_save(path, game_state.to_sections(), codec)
+        binary_save = time.perf_counter() - start
+        start = time.perf_counter()
+        with SaveReader(path) as save:
+            layers = {name[len("map."):]: save.array(name) for name in save.index if name.startswith("map.")}
+            Map.from_layers(save.json("map"), layers, None)
+            del layers
+        binary_load = time.perf_counter() - start
+        line += f" | {codec}{' delta' if delta else ''} {size / 1024:.1f} KiB, save {binary_save * 1000:.1f} ms, load {binary_load * 1000:.1f} ms"
+    print(line)
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in SIZES:
+            bench(width, height, directory)
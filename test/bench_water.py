@@ -0,0 +1,105 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.world.levels.dungeon_level import DungeonLevel
+from src.world.seeding import level_rngs
+from src.world.terrain import WALL, WATER
+
+SIZES = [(80, 20), (200, 200), (500, 500), (1000, 1000)]
+LEGACY_MAX_CELLS = 200 * 200
+
+def legacy_generate_water(map_array, water_seed_prob=0.02, water_iterations=5):
+    # The original per-cell loops from DungeonLevel, kept here as the reference.
+    height, width = map_array.shape
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            if map_array[y, x] == WALL and random.random() < water_seed_prob:
+                map_array[y, x] = WATER
+    for _ in range(water_iterations):
+        new_map = np.copy(map_array)
+        for y in range(1, height - 1):
+            for x in range(1, width - 1):
+                if map_array[y, x] == WALL:
+                    water_neighbors = 0
+                    for dy in [-1, 0, 1]:
+                        for dx in [-1, 0, 1]:
+                            if map_array[y + dy, x + dx] == WATER:
+                                water_neighbors += 1
+                    if water_neighbors >= 5:
+                        new_map[y, x] = WATER
+        map_array = new_map
+    return map_array
+
+def legacy_stamp_river(map_array, path, river_width):
+    height, width = map_array.shape
+    for x, y in path:
+        for i in range(-river_width // 2, river_width // 2 + 1):
+            for j in range(-river_width // 2, river_width // 2 + 1):
+                if 0 < x + i < width - 1 and 0 < y + j < height - 1:
+                    map_array[y + j, x + i] = WATER
+    return map_array
+
+def build_level(width, height, seed):
+    random.seed(seed)
+    level = DungeonLevel(width, height, *level_rngs(seed, 1))
+    for _ in range(max(4, width * height // 500)):
+        room_width, room_height = random.randint(5, 10), random.randint(5, 10)
+        level.add_room(random.randint(1, width - room_width - 1), random.randint(1, height - room_height - 1), room_width, room_height)
+    return level
+
+def bench_water(width, height, run_legacy, seeds=5):
+    legacy_times, new_times, legacy_fraction, new_fraction = [], [], [], []
+    for seed in range(seeds):
+        level = build_level(width, height, seed)
+        base = level.map_array.copy()
+
+        start = time.perf_counter()
+        level._generate_water()
+        new_times.append(time.perf_counter() - start)
+        new_fraction.append(np.mean(level.map_array == WATER))
+
+        if run_legacy:
+            start = time.perf_counter()
+            legacy = legacy_generate_water(base.copy())
+            legacy_times.append(time.perf_counter() - start)
+            legacy_fraction.append(np.mean(legacy == WATER))
+
+    line = f"water {width}x{height}: vectorized {np.median(new_times) * 1000:.2f} ms, water {np.mean(new_fraction):.4f}"
+    if run_legacy:
+        line += f" | legacy {np.median(legacy_times) * 1000:.1f} ms, water {np.mean(legacy_fraction):.4f}"
+    print(line)
+
+def bench_river(width, height, run_legacy):
+    level = build_level(width, height, 0)
+    path = level._a_star_path((1, 1), (width - 2, height - 2))
+    base = level.map_array.copy()
+    identical = True
+    for river_width in (3, 4):
+        level.map_array = base.copy()
+        start = time.perf_counter()
+        level._stamp_river(path, river_width)
+        line = f"river {width}x{height} width={river_width}: dilation {(time.perf_counter() - start) * 1000:.2f} ms"
+        if run_legacy:
+            start = time.perf_counter()
+            legacy = legacy_stamp_river(base.copy(), path, river_width)
+            match = np.array_equal(legacy, level.map_array)
+            identical = identical and match
+            line += f" | legacy {(time.perf_counter() - start) * 1000:.1f} ms, identical={match}"
+        print(line)
+    return identical
+
+if __name__ == "__main__":
+    all_legacy = "--all-legacy" in sys.argv
+    identical = True
+    for width, height in SIZES:
+        run_legacy = all_legacy or width * height <= LEGACY_MAX_CELLS
+        bench_water(width, height, run_legacy)
+        identical = bench_river(width, height, run_legacy) and identical
+    if not identical:
+        sys.exit("River dilation diverged from the legacy stamping loop.")
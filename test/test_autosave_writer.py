@@ -0,0 +1,23 @@
+import numpy as np
+
+from src.systems.autosave_writer import AutosaveWriter
+from src.systems.event_manager import EventManager
+from src.systems.save_format import read_json_section
+
+def test_writer_survives_a_snapshot_it_cannot_encode(tmp_path):
+    events, messages, failed = EventManager(), [], []
+    events.subscribe("game_message", messages.append)
+    writer = AutosaveWriter()
+    try:
+        # A NumPy scalar in a JSON section makes json.dumps raise TypeError, not OSError.
+        writer.submit(str(tmp_path / "bad.sav"), {"meta": {"turn": np.int64(3)}}, "none",
+                      event_manager=events, on_failed=lambda: failed.append(True))
+        writer.flush()
+        writer.submit(str(tmp_path / "good.sav"), {"meta": {"turn": 3}}, "none", event_manager=events)
+        writer.flush()
+    finally:
+        writer.shutdown()
+    events.dispatch_posted()
+    assert failed == [True]
+    assert messages[0].startswith("Autosave failed") and messages[1] == "Game Autosaved!"
+    assert read_json_section(str(tmp_path / "good.sav"), "meta") == {"turn": 3}
@@ -0,0 +1,26 @@
+from src.world.chunked_map import ChunkedMap
+from src.world.map_generator import BatchSettings
+from src.world.tiles import WallTile
+
+SETTINGS = BatchSettings({"chunk_size": 32, "max_resident_chunks": 9, "resident_chunk_radius": 1})
+
+def new_world():
+    world = ChunkedMap(320, 320, 99, 1, SETTINGS)
+    world.page_around(160, 160)
+    return world
+
+def test_reading_a_far_cell_pages_nothing_in():
+    world = new_world()
+    resident = world.resident_chunks()
+    tile = world.grid[5][5]
+    assert isinstance(tile, WallTile) and not tile.is_explored
+    assert world.is_wall(5, 5)
+    region, _, _ = world.transparent_region(0, 0, 20, 20)
+    assert not region.any()
+    assert world.resident_chunks() == resident
+
+def test_page_around_brings_chunks_in():
+    world = new_world()
+    world.page_around(5, 5)
+    assert world.is_loaded(5, 5)
+    assert len(world.resident_chunks()) <= 9
@@ -0,0 +1,23 @@
+import numpy as np
+
+from src.world.map_generator import MapGenerator, GenerationContext, BatchSettings
+
+SETTINGS = BatchSettings({"num_rooms": 20})
+
+def generate(world_seed, dungeon_level, width=80, height=40):
+    context = GenerationContext(SETTINGS, world_seed, dungeon_level)
+    return MapGenerator.generate_map(width, height, "dungeon", game_state=context)
+
+def test_same_seed_gives_byte_identical_grid():
+    first, second = generate(1234, 1), generate(1234, 1)
+    assert first[0].type_ids.tobytes() == second[0].type_ids.tobytes()
+    assert first[0].wall_codes.tobytes() == second[0].wall_codes.tobytes()
+    assert first[1] == second[1]  # Room centres
+    assert first[2] == second[2]  # Next-map tile
+    assert first[3] == second[3]  # Player spawn
+    assert np.array_equal(first[4], second[4]) and np.array_equal(first[5], second[5])
+
+def test_seed_and_level_change_the_grid():
+    grid = generate(1234, 1)[0].type_ids
+    assert not np.array_equal(grid, generate(1235, 1)[0].type_ids)
+    assert not np.array_equal(grid, generate(1234, 2)[0].type_ids)
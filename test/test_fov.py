@@ -0,0 +1,40 @@
+from src.world.map import Map
+from src.world.tiles import FLOOR
+from src.world.terrain import WALL
+
+class Viewer:
+    def __init__(self, x, y, last_direction='d'):
+        self.x, self.y, self.last_direction = x, y, last_direction
+
+def open_map():
+    game_map = Map(40, 40, generate=False)
+    game_map.tiles.set_types(FLOOR)
+    return game_map
+
+def test_unchanged_view_is_served_from_the_cache():
+    game_map, viewer = open_map(), Viewer(20, 20)
+    game_map.update_fov(viewer)
+    viewer.x += 1
+    game_map.update_fov(viewer)
+    viewer.x -= 1
+    game_map.update_fov(viewer)
+    assert (game_map.fov_cache.hits, game_map.fov_cache.misses) == (1, 2)
+
+def test_transparency_change_in_the_view_window_invalidates_the_cached_view():
+    game_map, viewer = open_map(), Viewer(20, 20)
+    game_map.update_fov(viewer)
+    assert game_map.is_visible(23, 20)
+
+    game_map.set_tile(22, 20, WALL)
+    assert game_map.fov_cache.invalidations == 1
+    game_map.update_fov(viewer)
+    assert game_map.fov_cache.misses == 2
+    assert game_map.is_visible(22, 20) and not game_map.is_visible(23, 20)
+
+def test_transparency_change_outside_the_view_window_keeps_the_cached_view():
+    game_map, viewer = open_map(), Viewer(20, 20)
+    game_map.update_fov(viewer)
+    game_map.set_tile(2, 2, WALL)
+    assert game_map.fov_cache.invalidations == 0
+    game_map.update_fov(viewer)
+    assert game_map.fov_cache.hits == 1
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.systems.level_pregenerator import LevelPregenerator
+from src.systems.save_format import SaveReader, write_save
+from src.systems.simulation import new_headless_game, random_walk, run_headless
+from src.world.map import Map
+from src.world.map_generator import BatchSettings
+from src.world.tiles import TRAP, FLAG_TRAP_TRIGGERED
+
+@pytest.fixture
+def played(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = new_headless_game(21, random_walk(21, 300), 100, 40)
+    run_headless(engine)
+    return engine.game_state
+
+def test_delta_save_round_trip(played):
+    game_map = played.game_map
+    game_map.set_tile(3, 3, TRAP)
+    game_map.tiles.set_flag(3, 3, FLAG_TRAP_TRIGGERED)
+    played.save_manager.save_game(played, "slot")
+    with SaveReader("saves/slot.sav") as save:
+        assert "map.type_ids" not in save  # Only the seed and what changed
+    loaded = played.save_manager.load_game("slot", played.logger)
+    assert np.array_equal(loaded.game_map.tiles.type_ids, game_map.tiles.type_ids)
+    assert loaded.game_map.tiles.get_flag(3, 3, FLAG_TRAP_TRIGGERED)
+    assert loaded.game_map.modified_cells == game_map.modified_cells
+    assert loaded.game_map.generation == game_map.generation
+
+def test_checksum_mismatch_refuses_the_save(played):
+    sections = played.to_sections()
+    sections["map"]["generation"]["checksum"] ^= 1
+    write_save("saves/drifted.sav", sections)
+    assert played.save_manager.load_game("drifted", played.logger) is None
+    assert played.logger.get_messages()[-1].startswith("Error: Cannot load drifted")
+
+def test_settings_changed_after_generation_still_load(played):
+    settings = played.settings_manager.settings
+    settings["num_rooms"] = 12
+    played.game_map = Map(100, 40, game_state=played)
+    settings["num_rooms"] = 3  # Changed after the level was built
+    played.save_manager.save_game(played, "slot")
+    loaded = played.save_manager.load_game("slot", played.logger)
+    assert loaded.game_map.generation["settings"]["num_rooms"] == 12
+    assert np.array_equal(loaded.game_map.tiles.type_ids, played.game_map.tiles.type_ids)
+
+def test_pregenerated_level_records_the_settings_it_was_built_with():
+    settings = BatchSettings({"num_rooms": 12})
+    pregenerator = LevelPregenerator(settings)
+    try:
+        pregenerator.schedule(80, 30, "dungeon", 5, 2)
+        pregenerator._pending.result()
+        settings.settings["num_rooms"] = 3
+        generation = {}
+        pregenerator.take(80, 30, "dungeon", 5, 2, generation=generation)
+    finally:
+        pregenerator.shutdown()
+    assert pregenerator.hits == 1
+    assert generation["settings"]["num_rooms"] == 12
@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.systems.save_format import write_save, SaveReader, is_binary_save, read_index
+from src.systems.simulation import new_headless_game, random_walk, run_headless
+
+@pytest.fixture
+def played(tmp_path, monkeypatch):
+    # SaveManager keeps its saves under the working directory.
+    monkeypatch.chdir(tmp_path)
+    engine = new_headless_game(11, random_walk(11, 300), 100, 40, {"save_terrain_delta": False})
+    run_headless(engine)
+    return engine.game_state
+
+def assert_same_game(loaded, game_state):
+    assert (loaded.player.x, loaded.player.y) == (game_state.player.x, game_state.player.y)
+    assert loaded.player.state.to_dict() == game_state.player.state.to_dict()
+    assert loaded.dungeon_level == game_state.dungeon_level
+    assert loaded.world_seed == game_state.world_seed
+    assert np.array_equal(loaded.game_map.tiles.type_ids, game_state.game_map.tiles.type_ids)
+    assert np.array_equal(loaded.game_map.tiles.wall_codes, game_state.game_map.tiles.wall_codes)
+    assert np.array_equal(loaded.game_map.room_mask, game_state.game_map.room_mask)
+    # Loading recomputes the view, which can only add explored cells around the player.
+    explored, loaded_explored = game_state.game_map.tiles.explored_mask(), loaded.game_map.tiles.explored_mask()
+    assert not (explored & ~loaded_explored).any()
+
+def test_sections_round_trip(tmp_path):
+    sections = {"doc": {"a": [1, 2]}, "bits": np.arange(77) % 3 == 0, "ints": np.arange(12, dtype=np.int32).reshape(3, 4)}
+    for codec in ("none", "zlib"):
+        path = str(tmp_path / f"{codec}.sav")
+        write_save(path, sections, codec)
+        assert is_binary_save(path) and set(read_index(path)) == set(sections)
+        with SaveReader(path) as save:
+            assert save.json("doc") == sections["doc"]
+            assert np.array_equal(save.array("bits"), sections["bits"])
+            assert np.array_equal(save.array("ints"), sections["ints"])
+
+@pytest.mark.parametrize("codec", ["none", "zlib"])
+def test_binary_save_round_trip(played, codec):
+    played.settings_manager.settings["save_compression"] = codec
+    played.save_manager.save_game(played, "slot")
+    loaded = played.save_manager.load_game("slot", played.logger)
+    assert_same_game(loaded, played)
+
+def test_legacy_json_save_loads(played):
+    with open("saves/old.json", "w") as f:
+        json.dump(played.to_dict(), f)
+    assert_same_game(played.save_manager.load_game("old", played.logger), played)
+
+def test_oldest_json_layout_loads(played):
+    # The oldest saves named the map "map" and kept the player's stats outside "state".
+    data = played.to_dict()
+    data["map"] = data.pop("game_map")
+    player = data["player"]
+    player.update(player.pop("state"))
+    with open("saves/oldest.json", "w") as f:
+        json.dump(data, f)
+    assert_same_game(played.save_manager.load_game("oldest", played.logger), played)
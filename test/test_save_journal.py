@@ -0,0 +1,130 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src.systems import autosave_writer
+from src.systems.save_journal import NEXT_SUFFIX
+from src.systems.save_manager import SaveManager
+from src.systems.simulation import new_headless_game, random_walk, run_headless
+from src.world.tiles import TRAP
+
+JOURNAL = "saves/autosave.journal"
+
+@pytest.fixture
+def played(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = new_headless_game(31, random_walk(31, 200), 100, 40,
+                               {"autosave_overwrite_behavior": "always_overwrite", "autosave_compact_every": 3})
+    run_headless(engine)
+    return engine.game_state
+
+def play_a_turn(game_state, step):
+    """Changes a little of everything an autosave journals."""
+    game_state.player.state.health -= 1
+    game_state.game_map.merge_explored(np.ones((2, 2), dtype=bool), 2 * step + 1, 1)
+    game_state.game_map.set_tile(2 * step + 1, 5, TRAP)
+
+def autosave(game_state):
+    game_state.save_manager.save_game(game_state, "autosave", is_autosave=True)
+
+def load_after_crash(game_state):
+    """Loads the autosave the way a restarted game would, with nothing of this session's SaveManager."""
+    return SaveManager(game_state.ui_manager, game_state.settings_manager).load_game("autosave", game_state.logger)
+
+def assert_same_game(loaded, game_state):
+    assert loaded.player.state.health == game_state.player.state.health
+    assert loaded.game_map.modified_cells == game_state.game_map.modified_cells
+    assert np.array_equal(loaded.game_map.tiles.type_ids, game_state.game_map.tiles.type_ids)
+    explored, loaded_explored = game_state.game_map.tiles.explored_mask(), loaded.game_map.tiles.explored_mask()
+    assert not (explored & ~loaded_explored).any()
+
+def test_journal_replays_over_its_snapshot(played):
+    for step in range(3):
+        autosave(played)
+        play_a_turn(played, step)
+    autosave(played)
+    assert os.path.getsize(JOURNAL) < 2000
+    assert_same_game(load_after_crash(played), played)
+
+def test_cut_short_last_entry_is_ignored(played):
+    autosave(played)
+    play_a_turn(played, 0)
+    autosave(played)
+    health = played.player.state.health
+    play_a_turn(played, 1)
+    autosave(played)
+    with open(JOURNAL, "r+b") as f:
+        f.truncate(os.path.getsize(JOURNAL) - 3)
+    loaded = load_after_crash(played)
+    assert loaded.player.state.health == health
+    assert (3, 5) not in loaded.game_map.modified_cells
+
+@pytest.fixture
+def stalled_writer(monkeypatch):
+    """Holds every background snapshot before it is written; set the event to let them through."""
+    release = threading.Event()
+    write_save = autosave_writer.write_save
+    def stalled(*args):
+        release.wait()
+        write_save(*args)
+    monkeypatch.setattr(autosave_writer, "write_save", stalled)
+    yield release
+    release.set()
+
+def test_crash_before_new_snapshot_keeps_old_journal(played, stalled_writer):
+    autosave(played)  # The first snapshot is written before returning
+    for step in range(5):
+        play_a_turn(played, step)
+        autosave(played)  # The third append starts a new snapshot, which never reaches the disk
+    assert os.path.exists(JOURNAL + NEXT_SUFFIX)
+    assert_same_game(load_after_crash(played), played)
+
+def test_crash_before_new_journal_is_moved_into_place(played, stalled_writer):
+    autosave(played)
+    for step in range(5):
+        play_a_turn(played, step)
+        autosave(played)
+    stalled_writer.set()
+    played.save_manager._autosave_writer.flush()  # The snapshot lands; the game stops before the journal's rename
+    assert os.path.exists(JOURNAL + NEXT_SUFFIX)
+    assert_same_game(load_after_crash(played), played)
+
+def test_new_journal_replaces_old_once_snapshot_is_written(played):
+    autosave(played)
+    for step in range(5):
+        play_a_turn(played, step)
+        autosave(played)
+    played.save_manager.shutdown()
+    assert not os.path.exists(JOURNAL + NEXT_SUFFIX)
+    assert_same_game(load_after_crash(played), played)
+
+def test_save_list_shows_the_last_journaled_autosave(played):
+    autosave(played)
+    listed = played.save_manager.list_saves_detailed()[0]
+    play_a_turn(played, 0)
+    played.play_time += 600
+    autosave(played)
+    details = played.save_manager.list_saves_detailed()[0]
+    assert details["health"] == played.player.state.health == listed["health"] - 1
+    assert details["play_time"] >= listed["play_time"] + 600
+    assert details["saved_at"] == os.path.getmtime(JOURNAL)
+
+def test_failed_snapshot_is_retried(played, monkeypatch):
+    write_save = autosave_writer.write_save
+    def full_disk(*args):
+        raise OSError("No space left on device")
+    monkeypatch.setattr(autosave_writer, "write_save", full_disk)
+    autosave(played)
+    for step in range(3):
+        play_a_turn(played, step)
+        autosave(played)  # The third starts a snapshot, which fails
+    played.save_manager._autosave_writer.flush()
+    monkeypatch.setattr(autosave_writer, "write_save", write_save)
+    play_a_turn(played, 3)
+    autosave(played)  # Drops the failed snapshot's journal and starts another
+    played.save_manager.shutdown()
+    assert not os.path.exists(JOURNAL + NEXT_SUFFIX)
+    assert not played.save_manager._journals[JOURNAL].pending
+    assert_same_game(load_after_crash(played), played)
@@ -0,0 +1,25 @@
+import random
+
+from src.world.spatial import PointIndex
+
+def kruskal(count, edges):
+    parent = list(range(count))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    tree = []
+    for _, i, j in edges:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_i] = root_j
+            tree.append((i, j))
+    return tree
+
+def test_octant_edges_give_the_all_pairs_tree():
+    for count in (2, 30, 250):
+        rng = random.Random(count)
+        side = int((count * 120) ** 0.5)
+        index = PointIndex([(rng.randint(1, side), rng.randint(1, side)) for _ in range(count)])
+        assert kruskal(count, index.octant_neighbor_edges()) == kruskal(count, index.all_pair_edges())
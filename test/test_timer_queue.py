@@ -0,0 +1,45 @@
+from src.systems.timer_queue import TimerQueue
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def test_time_until_next_follows_schedule_cancel_and_advance():
+    clock = FakeClock()
+    timers = TimerQueue(clock=clock)
+    assert timers.time_until_next() is None and timers.time_until_next(0.5) == 0.5
+    ran = []
+    timers.schedule(5.0, lambda: ran.append("late"))
+    soon = timers.schedule(1.0, lambda: ran.append("soon"))
+    assert abs(timers.time_until_next() - 1.0) < 1e-9
+    soon.cancel()
+    assert abs(timers.time_until_next() - 5.0) < 1e-9
+    clock.now += 5.0
+    assert timers.advance() == 1 and ran == ["late"]
+    assert timers.time_until_next() is None
+
+def test_repeating_timer_is_rescheduled():
+    clock = FakeClock()
+    timers = TimerQueue(clock=clock)
+    ran = []
+    timers.schedule(0.5, lambda: ran.append(clock.now), interval=0.5)
+    for _ in range(4):
+        clock.now += 0.5
+        timers.advance()
+        assert abs(timers.time_until_next() - 0.5) < 1e-9
+    assert len(ran) == 4
+    assert len(timers._heap) == 1
+
+def test_a_timer_is_due_exactly_when_the_wait_runs_out():
+    clock = FakeClock()
+    timers = TimerQueue(clock=clock)
+    ran = []
+    timers.schedule(1.0, lambda: ran.append(clock.now))
+    # Waking a hair early must leave a wait, not report it due and then not run it.
+    clock.now += 1.0 - 0.0005
+    assert timers.time_until_next() > 0 and timers.advance() == 0
+    clock.now += timers.time_until_next()
+    assert timers.time_until_next() == 0 and timers.advance() == 1